@@ -1,12 +1,21 @@
-def reconstruct_path(choice, healthy_DNA, mutated_DNA, verbose=True, visual_callback=None):
+import heapq
+
+from dp_model import PRED_DIAG, PRED_UP, PRED_LEFT
+from profiling import profiled, count
+
+
+@profiled("traceback")
+def reconstruct_path(choice, healthy_DNA, mutated_DNA, verbose=True, visual_callback=None, out=None):
     i, j = len(healthy_DNA), len(mutated_DNA)
     steps = []           #list of operations in chronological order
+    walked = 0           #cells visited, reported to the profiler
 
     if verbose:
-        print("\nBacktracking Steps:")
+        print("\nBacktracking Steps:", file=out)      #out=None prints to stdout
 
     while i > 0 or j > 0:          # Continue until we reach the start of both sequences
         action = choice[i][j]
+        walked += 1
 
         # Call the visual callback if provided
         if visual_callback is not None:             #used to visualize steps in GUI
@@ -14,7 +23,7 @@ def reconstruct_path(choice, healthy_DNA, mutated_DNA, verbose=True, visual_call
 
         if action == "MATCH":                 #characters match, no cost, move diagonally
             if verbose:
-                print(f"At dp[{i}][{j}]: MATCH '{healthy_DNA[i-1]}' → move to dp[{i-1}][{j-1}]")
+                print(f"At dp[{i}][{j}]: MATCH '{healthy_DNA[i-1]}' → move to dp[{i-1}][{j-1}]", file=out)
             i -= 1
             j -= 1
 
@@ -22,7 +31,8 @@ def reconstruct_path(choice, healthy_DNA, mutated_DNA, verbose=True, visual_call
             if verbose:
                 print(
                     f"At dp[{i}][{j}]: SUBSTITUTE '{healthy_DNA[i-1]}' → '{mutated_DNA[j-1]}' "
-                    f"→ move to dp[{i-1}][{j-1}]"
+                    f"→ move to dp[{i-1}][{j-1}]",
+                    file=out
                 )
             steps.append(f"Substitute {healthy_DNA[i-1]} → {mutated_DNA[j-1]}")     #record the operation in the steps list
             i -= 1
@@ -32,7 +42,8 @@ def reconstruct_path(choice, healthy_DNA, mutated_DNA, verbose=True, visual_call
             if verbose:
                 print(
                     f"At dp[{i}][{j}]: DELETE '{healthy_DNA[i-1]}' "
-                    f"→ move to dp[{i-1}][{j}]"
+                    f"→ move to dp[{i-1}][{j}]",
+                    file=out
                 )
             steps.append(f"Delete {healthy_DNA[i-1]}")
             i -= 1
@@ -41,7 +52,8 @@ def reconstruct_path(choice, healthy_DNA, mutated_DNA, verbose=True, visual_call
             if verbose:
                 print(
                     f"At dp[{i}][{j}]: INSERT '{mutated_DNA[j-1]}' "
-                    f"→ move to dp[{i}][{j-1}]"
+                    f"→ move to dp[{i}][{j-1}]",
+                    file=out
                 )
             steps.append(f"Insert {mutated_DNA[j-1]}")
             j -= 1
@@ -49,4 +61,172 @@ def reconstruct_path(choice, healthy_DNA, mutated_DNA, verbose=True, visual_call
         else:
             raise ValueError(f"Unknown action at dp[{i}][{j}]")   #Error handling for unexpected action
 
+    count(cells=walked)
     return steps[::-1]     #reverse the steps to get chronological order
+
+
+
+@profiled("count")
+def count_optimal_paths(pred):
+    # Number of co-optimal pathways, computed by DP over the predecessor masks
+    # (no enumeration, so it stays cheap even when the count explodes).
+    # paths[i][j] = number of optimal ways to reach cell (i, j) from (0, 0)
+    n, m = len(pred) - 1, len(pred[0]) - 1
+    prev = None
+    for i in range(n + 1):
+        row = [0] * (m + 1)
+        pred_row = pred[i]
+        for j in range(m + 1):
+            if i == 0 and j == 0:
+                row[j] = 1
+                continue
+            mask = pred_row[j]
+            total = 0
+            if mask & PRED_DIAG:
+                total += prev[j - 1]
+            if mask & PRED_UP:
+                total += prev[j]
+            if mask & PRED_LEFT:
+                total += row[j - 1]
+            row[j] = total
+        prev = row
+    count(cells=(n + 1) * (m + 1))
+    return prev[m]
+
+
+# Single-character operation codes used by reconstruct_ops
+OP_MATCH = "="
+OP_SUBSTITUTE = "X"
+OP_DELETE = "D"
+OP_INSERT = "I"
+
+
+def _step_op(i, j, move, mutated_DNA, healthy_DNA):
+    # Op code of the move into dp[i][j] (matches included, so positions are kept)
+    if move == PRED_DIAG:
+        return OP_MATCH if mutated_DNA[i - 1] == healthy_DNA[j - 1] else OP_SUBSTITUTE
+    if move == PRED_UP:
+        return OP_DELETE
+    return OP_INSERT
+
+
+def _unwind(node):
+    # node is a linked list (op, parent) built from the end of the pathway,
+    # so walking it yields the op-code string in chronological order
+    ops = []
+    while node is not None:
+        op, node = node
+        ops.append(op)
+    return "".join(ops)
+
+
+_MOVES = ((PRED_DIAG, 1, 1), (PRED_UP, 1, 0), (PRED_LEFT, 0, 1))
+
+
+def enumerate_optimal_paths(pred, mutated_DNA, healthy_DNA, limit=None):
+    # Lazily yields every co-optimal pathway as an op-code string (same format as
+    # reconstruct_ops, so iter_op_records/ops_to_cigar give each event's position).
+    # Depth-first over the predecessor masks: only the current branch is kept in
+    # memory, and suffixes are shared between pathways through a linked list.
+    n, m = len(mutated_DNA), len(healthy_DNA)
+    stack = [(n, m, None)]
+    produced = 0
+
+    while stack:
+        i, j, node = stack.pop()
+        if i == 0 and j == 0:          # reached the start: one complete pathway
+            yield _unwind(node)
+            produced += 1
+            if limit is not None and produced >= limit:
+                return
+            continue
+
+        mask = pred[i][j]
+        # Push in reverse so the sub > delete > insert tie-break comes out first
+        for move, di, dj in reversed(_MOVES):
+            if mask & move:
+                op = _step_op(i, j, move, mutated_DNA, healthy_DNA)
+                stack.append((i - di, j - dj, (op, node)))
+
+
+def enumerate_k_best_paths(dp, mutated_DNA, healthy_DNA, ins_cost, del_cost, sub_cost, k=None):
+    # Lazily yields (cost, ops) for the k cheapest pathways, cheapest first (ops as
+    # in enumerate_optimal_paths).
+    # Best-first search from dp[n][m] back to dp[0][0]; dp[i][j] is the exact
+    # remaining cost to the start, so every popped complete pathway is the next best.
+    n, m = len(mutated_DNA), len(healthy_DNA)
+    heap = [(dp[n][m], 0, 0, n, m, None)]   # (total estimate, tie counter, cost so far, i, j, ops)
+    counter = 1
+    produced = 0
+
+    while heap:
+        total, _, spent, i, j, node = heapq.heappop(heap)
+        if i == 0 and j == 0:
+            yield total, _unwind(node)
+            produced += 1
+            if k is not None and produced >= k:
+                return
+            continue
+
+        for move, di, dj in _MOVES:
+            pi, pj = i - di, j - dj
+            if pi < 0 or pj < 0:
+                continue
+            if move == PRED_DIAG:
+                cost = 0 if mutated_DNA[i - 1] == healthy_DNA[j - 1] else sub_cost
+            elif move == PRED_UP:
+                cost = del_cost
+            else:
+                cost = ins_cost
+            op = _step_op(i, j, move, mutated_DNA, healthy_DNA)
+            heapq.heappush(heap, (spent + cost + dp[pi][pj], counter, spent + cost, pi, pj, (op, node)))
+            counter += 1
+
+
+_ACTION_OPS = {"MATCH": (OP_MATCH, 1, 1), "SUBSTITUTE": (OP_SUBSTITUTE, 1, 1),
+               "DELETE": (OP_DELETE, 1, 0), "INSERT": (OP_INSERT, 0, 1)}
+
+
+@profiled("traceback")
+def reconstruct_ops(choice, n, m):
+    # Silent traceback that returns the pathway as a compact string of op codes
+    # (chronological order, matches included) instead of formatted step strings.
+    # n = len(mutated_DNA) (rows), m = len(healthy_DNA) (columns)
+    i, j = n, m
+    ops = []
+    while i > 0 or j > 0:
+        try:
+            op, di, dj = _ACTION_OPS[choice[i][j]]
+        except KeyError:
+            raise ValueError(f"Unknown action at dp[{i}][{j}]")
+        ops.append(op)
+        i -= di
+        j -= dj
+    count(cells=len(ops))
+    ops.reverse()
+    return "".join(ops)
+
+
+@profiled("traceback")
+def reconstruct_ops_from_masks(pred, mutated_DNA, healthy_DNA):
+    # Same as reconstruct_ops but over predecessor masks, using the
+    # sub > delete > insert tie-break of compute_dp_table
+    i, j = len(mutated_DNA), len(healthy_DNA)
+    ops = []
+    while i > 0 or j > 0:
+        mask = pred[i][j]
+        if mask & PRED_DIAG:
+            ops.append(OP_MATCH if mutated_DNA[i - 1] == healthy_DNA[j - 1] else OP_SUBSTITUTE)
+            i -= 1
+            j -= 1
+        elif mask & PRED_UP:
+            ops.append(OP_DELETE)
+            i -= 1
+        elif mask & PRED_LEFT:
+            ops.append(OP_INSERT)
+            j -= 1
+        else:
+            raise ValueError(f"Empty predecessor mask at dp[{i}][{j}]")
+    count(cells=len(ops))
+    ops.reverse()
+    return "".join(ops)
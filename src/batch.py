@@ -0,0 +1,78 @@
+"""
+One-reference-vs-many batch alignment with shared-prefix row reuse.
+
+Row i of the DP table depends only on mutated_DNA[:i] (and the healthy
+reference), so samples sharing a prefix share those rows. Sorting the
+samples lexicographically visits them in depth-first order of their
+prefix trie; between consecutive samples only the rows past their
+longest common prefix are popped from the row stack and recomputed.
+
+With max_cost, a trie branch is abandoned as soon as a whole row is above
+it (costs never decrease from one row to the next when all costs are
+non-negative), and every later sample under that prefix is skipped
+without computing a row.
+"""
+
+from dp_model import initial_dp_row, next_dp_row
+from backtracking import reconstruct_ops
+from profiling import profiled, count
+
+
+def _common_prefix_length(a, b):
+    limit = min(len(a), len(b))
+    k = 0
+    while k < limit and a[k] == b[k]:
+        k += 1
+    return k
+
+
+@profiled("fill")
+def align_batch_shared_prefix(healthy_DNA, mutated_samples, ins_cost, del_cost, sub_cost, with_paths=True,
+                              max_cost=None):
+    # Aligns every sample against the same healthy sequence.
+    # Returns one dict per sample, in input order: {"cost": int, "ops": str or None}
+    # plus the number of DP rows actually computed (sum of sample lengths without reuse).
+    # With max_cost, samples whose cost exceeds it get {"cost": None, "ops": None}.
+    order = sorted(range(len(mutated_samples)), key=mutated_samples.__getitem__)
+    m = len(healthy_DNA)
+
+    first_row, first_choice = initial_dp_row(healthy_DNA, ins_cost)
+    rows = [first_row]            # rows[i] = dp row for the current sample prefix of length i
+    choices = [first_choice]      # matching choice rows, used for the traceback
+    previous = ""
+    dead = None                   # prefix whose last row is entirely above max_cost
+    rows_computed = 0
+    results = [None] * len(mutated_samples)
+
+    for index in order:
+        sample = mutated_samples[index]
+        if dead is not None and sample.startswith(dead):
+            results[index] = {"cost": None, "ops": None}
+            continue
+        # Pop back to the longest common prefix with the previous sample (trie backtrack)
+        keep = _common_prefix_length(previous, sample) + 1
+        del rows[keep:]
+        del choices[keep:]
+
+        # Descend: compute only the rows for the new suffix
+        for i in range(len(rows), len(sample) + 1):
+            row, choice_row = next_dp_row(rows[-1], i, sample[i - 1], healthy_DNA,
+                                           ins_cost, del_cost, sub_cost, with_choice=with_paths)
+            rows.append(row)
+            choices.append(choice_row)
+            rows_computed += 1
+            count(cells=m)
+            if max_cost is not None and min(row) > max_cost:
+                dead = sample[:i]
+                break
+        # The row stack now holds exactly the rows of this prefix
+        previous = sample[:len(rows) - 1]
+
+        n = len(sample)
+        if len(rows) <= n or (max_cost is not None and rows[n][m] > max_cost):
+            results[index] = {"cost": None, "ops": None}
+            continue
+        ops = reconstruct_ops(choices, n, m) if with_paths else None
+        results[index] = {"cost": rows[n][m], "ops": ops}
+
+    return results, rows_computed
@@ -0,0 +1,83 @@
+"""
+Startup benchmark: measures how long importing each entry point takes in a
+fresh interpreter and which heavy modules it drags in.
+
+    python bench_startup.py            # CLI and GUI module imports
+    python bench_startup.py --window   # also time until the GUI window is shown
+
+The CLI (main) must never load Qt, matplotlib or NumPy.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+HEAVY_MODULES = ("PyQt5", "matplotlib", "numpy")
+
+# Child script: import the module, report elapsed time and heavy modules loaded
+IMPORT_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+heavy = sorted({{name.split('.')[0] for name in sys.modules}} & set({heavy!r}))
+print(json.dumps({{"seconds": elapsed, "heavy": heavy}}))
+"""
+
+# Child script: time from interpreter start to the first shown, painted window
+WINDOW_PROBE = """
+import json, time
+start = time.perf_counter()
+from gui import DNAMutationGUI, QApplication
+app = QApplication([])
+window = DNAMutationGUI()
+window.show()
+app.processEvents()
+print(json.dumps({"seconds": time.perf_counter() - start, "heavy": []}))
+"""
+
+
+def run_probe(code, repeat):
+    # Best of `repeat` fresh interpreters, so the OS file cache is warm
+    src_dir = os.path.dirname(os.path.abspath(__file__))
+    best = None
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", code], cwd=src_dir,
+                                capture_output=True, text=True, check=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        if best is None or result["seconds"] < best["seconds"]:
+            best = result
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure entry-point import time.")
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per probe (default: 5)")
+    parser.add_argument("--window", action="store_true", help="also time until the GUI window is shown")
+    args = parser.parse_args(argv)
+
+    status = 0
+    probes = [("main", IMPORT_PROBE.format(module="main", heavy=HEAVY_MODULES)),
+              ("gui", IMPORT_PROBE.format(module="gui", heavy=HEAVY_MODULES))]
+    if args.window:
+        probes.append(("gui window", WINDOW_PROBE))
+
+    for name, code in probes:
+        try:
+            result = run_probe(code, args.repeat)
+        except subprocess.CalledProcessError as e:
+            print(f"{name:<12} failed: {e.stderr.strip().splitlines()[-1]}")
+            status = 1
+            continue
+        heavy = ", ".join(result["heavy"]) or "none"
+        print(f"{name:<12} {result['seconds'] * 1000:8.1f} ms   heavy modules: {heavy}")
+        if name == "main" and result["heavy"]:
+            print("  error: the CLI must not import " + heavy)
+            status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""
+Windowed mutation density along the healthy coordinate.
+
+One pass over the traceback (either the op-code string from
+reconstruct_ops or the choice table itself) bins every event into
+fixed-size windows of the healthy sequence. Extra memory is one counter
+per window, plus the event positions when they are requested; no step
+strings are built.
+
+Event coordinates are 0-based positions in the healthy sequence:
+  SUBSTITUTE / INSERT  the healthy base that is replaced / missing
+  DELETE               the healthy base the extra mutated base precedes
+                       (clipped to the last base)
+"""
+
+from array import array
+
+import numpy as np
+
+# Columns of the counts array
+SUBSTITUTIONS, INSERTIONS, DELETIONS = 0, 1, 2
+EVENT_NAMES = ("SUBSTITUTE", "INSERT", "DELETE")
+
+
+def _new_state(healthy_length, window, with_positions):
+    n_windows = max(1, -(-healthy_length // window))
+    flat = [0] * (n_windows * 3)     # window-major: [sub, ins, del] per window
+    positions = [array("q") for _ in EVENT_NAMES] if with_positions else None
+    return n_windows, flat, positions
+
+
+def _finish(n_windows, flat, positions, reverse):
+    counts = np.array(flat, dtype=np.int64).reshape(n_windows, 3)
+    if positions is None:
+        return counts, None
+    result = {}
+    for name, values in zip(EVENT_NAMES, positions):
+        arr = np.frombuffer(values, dtype=np.int64) if len(values) else np.zeros(0, dtype=np.int64)
+        result[name] = arr[::-1].copy() if reverse else arr
+    return counts, result
+
+
+def density_from_ops(ops, healthy_length, window=100, with_positions=False):
+    # ops: op-code string ('=', 'X', 'D', 'I') in chronological order.
+    # Returns (counts, positions): counts is an (n_windows, 3) int array of
+    # substitutions/insertions/deletions per window; positions maps each event
+    # name to an int array of healthy coordinates (None unless with_positions).
+    n_windows, flat, positions = _new_state(healthy_length, window, with_positions)
+    last = max(healthy_length - 1, 0)
+    j = 0   # number of healthy bases consumed so far
+    for op in ops:
+        if op == "=":
+            j += 1
+            continue
+        if op == "X":
+            pos, kind = j, SUBSTITUTIONS
+            j += 1
+        elif op == "I":
+            pos, kind = j, INSERTIONS
+            j += 1
+        else:
+            pos, kind = min(j, last), DELETIONS
+        flat[(pos // window) * 3 + kind] += 1
+        if positions is not None:
+            positions[kind].append(pos)
+    return _finish(n_windows, flat, positions, reverse=False)
+
+
+def density_from_choice(choice, n, m, window=100, with_positions=False):
+    # Same result as density_from_ops, walking the choice table of
+    # compute_dp_table directly from dp[n][m] back to dp[0][0]
+    n_windows, flat, positions = _new_state(m, window, with_positions)
+    last = max(m - 1, 0)
+    i, j = n, m
+    while i > 0 or j > 0:
+        action = choice[i][j]
+        if action == "MATCH":
+            i -= 1
+            j -= 1
+            continue
+        if action == "SUBSTITUTE":
+            i -= 1
+            j -= 1
+            pos, kind = j, SUBSTITUTIONS
+        elif action == "INSERT":
+            j -= 1
+            pos, kind = j, INSERTIONS
+        elif action == "DELETE":
+            i -= 1
+            pos, kind = min(j, last), DELETIONS
+        else:
+            raise ValueError(f"Unknown action at dp[{i}][{j}]")
+        flat[(pos // window) * 3 + kind] += 1
+        if positions is not None:
+            positions[kind].append(pos)
+    return _finish(n_windows, flat, positions, reverse=True)
+
+
+def format_density_tsv(counts, window, healthy_length):
+    # One row per window: 1-based inclusive healthy coordinates, counts, events per base
+    lines = ["window_start\twindow_end\tsubstitutions\tinsertions\tdeletions\ttotal\tdensity"]
+    for k, (subs, ins, dels) in enumerate(counts.tolist()):
+        start = k * window
+        end = min(start + window, healthy_length)
+        total = subs + ins + dels
+        span = max(end - start, 1)
+        lines.append(f"{start + 1}\t{end}\t{subs}\t{ins}\t{dels}\t{total}\t{total / span:.4f}")
+    return "\n".join(lines) + "\n"
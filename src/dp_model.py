@@ -1,3 +1,7 @@
+from profiling import profiled, count
+
+
+@profiled("fill")
 def compute_dp_table(mutated_DNA, healthy_DNA, ins_cost, del_cost, sub_cost): 
     # dp[i][j] = minimum cost to convert mutated_DNA[0:i] into healthy_DNA[0:j]
 
@@ -45,4 +49,103 @@ def compute_dp_table(mutated_DNA, healthy_DNA, ins_cost, del_cost, sub_cost):
             else: # Insert
                 choice[i][j] = "INSERT"
 
+    count(cells=n * m)
     return dp, choice
+
+
+# Predecessor bitmask flags (one byte per cell, several may be set on ties)
+PRED_DIAG = 1   # match / substitute: came from dp[i-1][j-1]
+PRED_UP = 2     # delete: came from dp[i-1][j]
+PRED_LEFT = 4   # insert: came from dp[i][j-1]
+
+
+@profiled("fill")
+def compute_pred_masks(mutated_DNA, healthy_DNA, ins_cost, del_cost, sub_cost):
+    # Same recurrence as compute_dp_table, but instead of a single choice string
+    # every cell keeps a bitmask of ALL predecessors that reach the minimum cost.
+    # This keeps every co-optimal pathway instead of one arbitrary tie-break.
+
+    n, m = len(mutated_DNA), len(healthy_DNA) # lengths of sequences
+
+    dp = [[0] * (m + 1) for i in range(n + 1)] # DP table Initialization
+    pred = [bytearray(m + 1) for i in range(n + 1)] # One byte per cell
+
+    # Base cases
+    for i in range(1, n + 1):  # First column: only deletions
+        dp[i][0] = i * del_cost
+        pred[i][0] = PRED_UP
+
+    for j in range(1, m + 1): # First row: only insertions
+        dp[0][j] = j * ins_cost
+        pred[0][j] = PRED_LEFT
+
+    # Fill DP table
+    for i in range(1, n + 1):
+        prev_row, row, pred_row = dp[i - 1], dp[i], pred[i]
+        base = mutated_DNA[i - 1]
+        for j in range(1, m + 1):
+            sub = prev_row[j - 1] if base == healthy_DNA[j - 1] else prev_row[j - 1] + sub_cost
+            delete = prev_row[j] + del_cost
+            insert = row[j - 1] + ins_cost
+
+            best = min(sub, delete, insert)
+            row[j] = best
+
+            # Record every operation that ties for the minimum
+            mask = 0
+            if sub == best:
+                mask |= PRED_DIAG
+            if delete == best:
+                mask |= PRED_UP
+            if insert == best:
+                mask |= PRED_LEFT
+            pred_row[j] = mask
+
+    count(cells=n * m)
+    return dp, pred
+
+
+def initial_dp_row(healthy_DNA, ins_cost):
+    # Row 0 of the DP table and its choices (insert every healthy base)
+    m = len(healthy_DNA)
+    return [j * ins_cost for j in range(m + 1)], [None] + ["INSERT"] * m
+
+
+def next_dp_row(prev_row, i, base, healthy_DNA, ins_cost, del_cost, sub_cost, with_choice=True):
+    # Row i of the DP table from row i-1, where base = mutated_DNA[i-1].
+    # Same recurrence and tie-break as compute_dp_table, for callers that only
+    # keep a few rows in memory. Returns (row, choice_row); choice_row is None
+    # when with_choice is False.
+    m = len(healthy_DNA)
+    row = [0] * (m + 1)
+    row[0] = i * del_cost
+
+    if not with_choice:
+        for j in range(1, m + 1):
+            sub = prev_row[j - 1] if base == healthy_DNA[j - 1] else prev_row[j - 1] + sub_cost
+            delete = prev_row[j] + del_cost
+            insert = row[j - 1] + ins_cost
+            row[j] = min(sub, delete, insert)
+        return row, None
+
+    choice_row = [None] * (m + 1)
+    choice_row[0] = "DELETE"
+    for j in range(1, m + 1):
+        if base == healthy_DNA[j - 1]:
+            sub = prev_row[j - 1]
+            sub_action = "MATCH"
+        else:
+            sub = prev_row[j - 1] + sub_cost
+            sub_action = "SUBSTITUTE"
+        delete = prev_row[j] + del_cost
+        insert = row[j - 1] + ins_cost
+
+        best = min(sub, delete, insert)
+        row[j] = best
+        if best == sub:
+            choice_row[j] = sub_action
+        elif best == delete:
+            choice_row[j] = "DELETE"
+        else:
+            choice_row[j] = "INSERT"
+    return row, choice_row
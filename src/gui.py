@@ -18,10 +18,149 @@ from PyQt5.QtGui import QTextCursor, QFont, QPalette, QColor
 # Import PyQt5 core modules for events and timers
 from PyQt5.QtCore import Qt, QTimer
 
-# Import custom modules for DNA analysis algorithms
-from dp_model import compute_dp_table  # Dynamic programming table computation
-from backtracking import reconstruct_path  # Pathway reconstruction algorithm
-from visualization import print_dp_table  # Table visualization helper
+from profiling import profiled, count, instrument, phase
+
+# DNA analysis modules (dp_model, backtracking) and plotting libraries are
+# imported inside the methods that use them, so the window appears without
+# paying for them at startup
+
+# Most bars drawn in the hotspots plot; finer density reports are re-binned
+MAX_DENSITY_BARS = 50
+
+# Application stylesheet, parsed once by Qt when setup_styles applies it
+APP_STYLESHEET = """
+    /* Base widget styling */
+    QWidget {
+        background-color: #f5f5f5;
+        font-family: 'Segoe UI', Arial, sans-serif;
+    }
+
+    /* Group box styling */
+    QGroupBox {
+        font-weight: bold;
+        border: 2px solid #4CAF50;
+        border-radius: 6px;
+        margin-top: 10px;
+        padding-top: 10px;
+        background-color: white;
+    }
+
+    QGroupBox::title {
+        subcontrol-origin: margin;
+        left: 10px;
+        padding: 0 5px 0 5px;
+        color: #2E7D32;
+    }
+
+    /* Header label styling */
+    QLabel#header {
+        font-size: 20px;
+        font-weight: bold;
+        color: #1565C0;
+        padding: 10px;
+    }
+
+    /* Tab header styling */
+    QLabel#tabHeader {
+        font-size: 14px;
+        font-weight: bold;
+        color: #1976D2;
+        padding: 5px;
+    }
+
+    /* Button styling */
+    QPushButton {
+        background-color: #2196F3;
+        color: white;
+        border: none;
+        padding: 8px 16px;
+        border-radius: 4px;
+        font-weight: bold;
+    }
+
+    QPushButton:hover {
+        background-color: #1976D2;
+    }
+
+    QPushButton:pressed {
+        background-color: #0D47A1;
+    }
+
+    /* Special run button styling */
+    QPushButton#runButton {
+        background-color: #4CAF50;
+        font-size: 14px;
+        padding: 10px 20px;
+    }
+
+    QPushButton#runButton:hover {
+        background-color: #388E3C;
+    }
+
+    /* Text input styling */
+    QLineEdit {
+        padding: 6px;
+        border: 1px solid #ccc;
+        border-radius: 4px;
+        background-color: white;
+    }
+
+    /* Text display area styling */
+    QTextEdit {
+        background-color: white;
+        border: 1px solid #ddd;
+        border-radius: 4px;
+        padding: 5px;
+    }
+
+    /* Tab widget styling */
+    QTabWidget::pane {
+        border: 1px solid #ddd;
+        border-radius: 4px;
+        background-color: white;
+    }
+
+    QTabBar::tab {
+        background-color: #e0e0e0;
+        padding: 8px 16px;
+        margin-right: 2px;
+        border-radius: 4px 4px 0 0;
+    }
+
+    QTabBar::tab:selected {
+        background-color: white;
+        font-weight: bold;
+    }
+
+    QTabBar::tab:hover:!selected {
+        background-color: #f0f0f0;
+    }
+
+    /* Progress bar styling */
+    QProgressBar {
+        border: 1px solid #ccc;
+        border-radius: 4px;
+        text-align: center;
+    }
+
+    QProgressBar::chunk {
+        background-color: #4CAF50;
+        border-radius: 3px;
+    }
+
+    /* Status label styling */
+    QLabel#statusLabel {
+        color: #666;
+        font-style: italic;
+        padding: 5px;
+        border-top: 1px solid #ddd;
+    }
+
+    /* Table widget selection styling */
+    QTableWidget {
+        selection-background-color: #E3F2FD;
+    }
+"""
 
 
 class DNAMutationGUI(QWidget):
@@ -100,7 +239,15 @@ class DNAMutationGUI(QWidget):
         self.run_btn = QPushButton("🔬 Analyze Mutation Pathway")
         self.run_btn.setObjectName("runButton")  # For special CSS styling
         self.run_btn.clicked.connect(self.run_dp)  # Connect to analysis function
-        button_layout.addWidget(self.run_btn)
+        button_layout.addWidget(self.run_btn, 1)
+        self.save_btn = QPushButton("💾 Save Result")  # Binary .dnar result file
+        self.save_btn.clicked.connect(self.save_result_file)
+        self.save_btn.setEnabled(False)  # Enabled once an analysis has run
+        button_layout.addWidget(self.save_btn)
+        self.open_btn = QPushButton("📂 Open Result")  # Reopen a saved result without recomputing
+        self.open_btn.clicked.connect(self.open_result_file)
+        button_layout.addWidget(self.open_btn)
+        self.last_analysis = None  # (S, T, ops, cost, dp preview) of the last analysis, for saving
         main_layout.addLayout(button_layout)
         
         # Tab widget for organizing different views of results
@@ -148,10 +295,27 @@ class DNAMutationGUI(QWidget):
         dp_table_layout.addWidget(self.dp_table_widget)
         self.dp_table_tab.setLayout(dp_table_layout)
         
+        # Tab 4: Mutation hotspots (per-window density along the healthy sequence)
+        self.density_tab = QWidget()
+        self.density_layout = QVBoxLayout()
+        density_header_layout = QHBoxLayout()
+        self.density_header = QLabel("Mutation Density:")
+        self.density_header.setObjectName("tabHeader")  # For CSS styling
+        density_header_layout.addWidget(self.density_header, 1)
+        self.export_density_btn = QPushButton("💾 Export TSV")
+        self.export_density_btn.clicked.connect(self.export_density)
+        self.export_density_btn.setEnabled(False)  # Enabled once an analysis has run
+        density_header_layout.addWidget(self.export_density_btn)
+        self.density_layout.addLayout(density_header_layout)
+        self.density_canvas = None  # matplotlib canvas, created on first plot
+        self.density_result = None  # (counts, window, healthy_length) of the last analysis
+        self.density_tab.setLayout(self.density_layout)
+
         # Add all tabs to tab widget with icons and names
         self.tab_widget.addTab(self.results_tab, "📊 Summary")
         self.tab_widget.addTab(self.backtracking_tab, "🔍 Step-by-Step")
         self.tab_widget.addTab(self.dp_table_tab, "📈 DP Table")
+        self.tab_widget.addTab(self.density_tab, "🔥 Hotspots")
         
         # Add tab widget to main layout with stretch factor
         main_layout.addWidget(self.tab_widget, 1)
@@ -166,139 +330,7 @@ class DNAMutationGUI(QWidget):
         
     def setup_styles(self):
         """Apply professional styling to the GUI using CSS"""
-        self.setStyleSheet("""
-            /* Base widget styling */
-            QWidget {
-                background-color: #f5f5f5;
-                font-family: 'Segoe UI', Arial, sans-serif;
-            }
-            
-            /* Group box styling */
-            QGroupBox {
-                font-weight: bold;
-                border: 2px solid #4CAF50;
-                border-radius: 6px;
-                margin-top: 10px;
-                padding-top: 10px;
-                background-color: white;
-            }
-            
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px 0 5px;
-                color: #2E7D32;
-            }
-            
-            /* Header label styling */
-            QLabel#header {
-                font-size: 20px;
-                font-weight: bold;
-                color: #1565C0;
-                padding: 10px;
-            }
-            
-            /* Tab header styling */
-            QLabel#tabHeader {
-                font-size: 14px;
-                font-weight: bold;
-                color: #1976D2;
-                padding: 5px;
-            }
-            
-            /* Button styling */
-            QPushButton {
-                background-color: #2196F3;
-                color: white;
-                border: none;
-                padding: 8px 16px;
-                border-radius: 4px;
-                font-weight: bold;
-            }
-            
-            QPushButton:hover {
-                background-color: #1976D2;
-            }
-            
-            QPushButton:pressed {
-                background-color: #0D47A1;
-            }
-            
-            /* Special run button styling */
-            QPushButton#runButton {
-                background-color: #4CAF50;
-                font-size: 14px;
-                padding: 10px 20px;
-            }
-            
-            QPushButton#runButton:hover {
-                background-color: #388E3C;
-            }
-            
-            /* Text input styling */
-            QLineEdit {
-                padding: 6px;
-                border: 1px solid #ccc;
-                border-radius: 4px;
-                background-color: white;
-            }
-            
-            /* Text display area styling */
-            QTextEdit {
-                background-color: white;
-                border: 1px solid #ddd;
-                border-radius: 4px;
-                padding: 5px;
-            }
-            
-            /* Tab widget styling */
-            QTabWidget::pane {
-                border: 1px solid #ddd;
-                border-radius: 4px;
-                background-color: white;
-            }
-            
-            QTabBar::tab {
-                background-color: #e0e0e0;
-                padding: 8px 16px;
-                margin-right: 2px;
-                border-radius: 4px 4px 0 0;
-            }
-            
-            QTabBar::tab:selected {
-                background-color: white;
-                font-weight: bold;
-            }
-            
-            QTabBar::tab:hover:!selected {
-                background-color: #f0f0f0;
-            }
-            
-            /* Progress bar styling */
-            QProgressBar {
-                border: 1px solid #ccc;
-                border-radius: 4px;
-                text-align: center;
-            }
-            
-            QProgressBar::chunk {
-                background-color: #4CAF50;
-                border-radius: 3px;
-            }
-            
-            /* Status label styling */
-            QLabel#statusLabel {
-                color: #666;
-                font-style: italic;
-                padding: 5px;
-                border-top: 1px solid #ddd;
-            }
-            
-            /* Table widget selection styling */
-            QTableWidget {
-                selection-background-color: #E3F2FD;
-            }
-        """)
+        self.setStyleSheet(APP_STYLESHEET)
         
     def update_status(self, message, color="black"):
         """Update status bar message with color coding"""
@@ -370,8 +402,9 @@ class DNAMutationGUI(QWidget):
             return
         
         # Read DNA sequences from selected files
-        S = self.read_dna_from_file(self.s_path.text())  # Mutated DNA
-        T = self.read_dna_from_file(self.t_path.text())  # Healthy DNA
+        with instrument() as read_profiler:  # Timings start with the reads
+            S = self.read_dna_from_file(self.s_path.text())  # Mutated DNA
+            T = self.read_dna_from_file(self.t_path.text())  # Healthy DNA
         
         # Check if sequences were read successfully
         if not S or not T:
@@ -401,10 +434,21 @@ class DNAMutationGUI(QWidget):
         
         # Run dynamic programming analysis
         try:
-            # Compute DP table with substitution cost 2, indel cost 2, match cost -1
-            dp, choice = compute_dp_table(S, T, 2, 2, 1)
-            # Display results in GUI
-            self.display_results(S, T, dp, choice)
+            from dp_model import compute_dp_table  # Loaded on first analysis only
+            from backtracking import reconstruct_ops
+            from result_file import downsample_dp
+            with instrument() as prof:
+                # Compute DP table with substitution cost 2, indel cost 2, match cost -1
+                dp, choice = compute_dp_table(S, T, 2, 2, 1)
+                # Silent traceback, timed on its own; the display below replays it step by step
+                ops = reconstruct_ops(choice, len(S), len(T))
+                # Display results in GUI (animated steps, tables, density plot)
+                with phase("display"):
+                    self.display_results(S, T, dp, choice)
+            self.display_timings(read_profiler.report() + prof.report())
+            # Keep only what a result file needs; the full tables are freed after display
+            self.last_analysis = (S, T, ops, dp[len(S)][len(T)], downsample_dp(dp))
+            self.save_btn.setEnabled(True)
         except Exception as e:
             # Handle any errors during analysis
             self.update_status(f"Analysis error: {str(e)}", "error")
@@ -452,6 +496,7 @@ class DNAMutationGUI(QWidget):
         # Reconstruct mutation pathway using backtracking
         self.update_status("Reconstructing mutation pathway...", "black")
         # Call reconstruct_path with visual callback for step-by-step display
+        from backtracking import reconstruct_path
         steps = reconstruct_path(choice, S, T, verbose=False, 
                                 visual_callback=self.visualize_step)
         
@@ -484,6 +529,9 @@ class DNAMutationGUI(QWidget):
             for i, step in enumerate(steps, 1):
                 self.output.append(f"{i:3}. {step}")
         
+        # Per-window mutation density along the healthy sequence (one pass over the choice table)
+        self.update_density(choice, S, T)
+
         # Display DP table in table widget (visual representation)
         if len(S) <= 40 and len(T) <= 40:
             # Show full table for small sequences
@@ -495,6 +543,219 @@ class DNAMutationGUI(QWidget):
         # Update status bar with completion message
         self.update_status(f"Analysis complete - mutation cost: {min_distance}", "success")
         
+    def display_timings(self, rows):
+        """Append the time spent in each hooked phase (fill, traceback, ...) to the summary"""
+        self.output.append("")
+        self.output.append("⏱️ TIMINGS")
+        self.output.append("─" * 60)
+        for row in rows:
+            # Nested phases (the traceback replayed by the animated display) are indented
+            name = "  " + row["phase"] if row["nested"] else row["phase"]
+            if "cells_per_sec" in row:
+                rate = f"  ({row['cells_per_sec']:,.0f} cells/s)"
+            elif "bytes_per_sec" in row:
+                rate = f"  ({row['bytes_per_sec']:,.0f} B/s)"
+            else:
+                rate = ""
+            self.output.append(f"{name:<12} {row['seconds'] * 1000:9.1f} ms{rate}")
+
+    def update_density(self, choice, S, T):
+        """Compute per-window mutation counts and plot them in the hotspots tab"""
+        from density import density_from_choice  # NumPy is loaded on first analysis only
+
+        # About 50 windows across the healthy sequence, at least 10 bp each
+        window = max(10, -(-len(T) // 50))
+        counts, _ = density_from_choice(choice, len(S), len(T), window)
+        self.density_result = (counts, window, len(T))
+        self.export_density_btn.setEnabled(True)
+        self.density_header.setText(f"Mutation Density ({window} bp windows, {counts.shape[0]} windows):")
+        self.plot_density(counts, window)
+
+    def plot_density(self, counts, window):
+        """Stacked bar chart of substitutions/insertions/deletions per window"""
+        # matplotlib is only imported the first time a plot is shown
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
+
+        if self.density_canvas is None:
+            self.density_canvas = FigureCanvasQTAgg(Figure(figsize=(6, 3), tight_layout=True))
+            self.density_layout.addWidget(self.density_canvas, 1)
+
+        import numpy as np
+
+        # Merge neighbouring windows so at most MAX_DENSITY_BARS bars are drawn
+        # (one matplotlib patch per bar makes 30k-window plots take a minute)
+        rows = counts.shape[0]
+        factor = -(-rows // MAX_DENSITY_BARS)
+        if factor > 1:
+            counts = np.add.reduceat(np.asarray(counts), np.arange(0, rows, factor), axis=0)
+            window *= factor
+
+        figure = self.density_canvas.figure
+        figure.clear()
+        ax = figure.add_subplot(111)
+        starts = np.arange(counts.shape[0]) * window + 1
+        bottom = np.zeros(counts.shape[0], dtype=np.int64)
+        for column, (label, color) in enumerate((("Substitutions", "#2196F3"),
+                                                 ("Insertions", "#4CAF50"),
+                                                 ("Deletions", "#F44336"))):
+            values = counts[:, column]
+            ax.bar(starts, values, width=window, bottom=bottom, align="edge", label=label, color=color)
+            bottom = bottom + values
+        ax.set_xlabel("Healthy sequence position (bp)")
+        ax.set_ylabel(f"Mutations per {window:,} bp")
+        ax.legend(loc="upper right", fontsize=8)
+        self.density_canvas.draw_idle()
+
+    def export_density(self):
+        """Save the last density report as TSV"""
+        if self.density_result is None:
+            return
+        file_path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Export Mutation Density",
+            "mutation_density.tsv",
+            "TSV Files (*.tsv);;All Files (*)"
+        )
+        if not file_path:
+            return
+        from density import format_density_tsv
+
+        counts, window, healthy_length = self.density_result
+        try:
+            with open(file_path, "w") as f:
+                f.write(format_density_tsv(counts, window, healthy_length))
+            self.update_status(f"Density report saved: {os.path.basename(file_path)}", "success")
+        except OSError as e:
+            QMessageBox.warning(self, "Error", f"Could not save {os.path.basename(file_path)}: {str(e)}")
+
+    def save_result_file(self):
+        """Save the last analysis as a binary .dnar result file"""
+        if self.last_analysis is None:
+            return
+        file_path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Save Analysis Result",
+            "analysis.dnar",
+            "DNA Result Files (*.dnar);;All Files (*)"
+        )
+        if not file_path:
+            return
+        from result_file import save_result
+
+        S, T, ops, cost, preview = self.last_analysis
+        try:
+            save_result(file_path, S, T, ops, cost, {"ins": 2, "del": 2, "sub": 1}, dp_preview=preview)
+            self.update_status(f"Result saved: {os.path.basename(file_path)}", "success")
+        except OSError as e:
+            QMessageBox.warning(self, "Error", f"Could not save {os.path.basename(file_path)}: {str(e)}")
+
+    def open_result_file(self):
+        """Open a saved .dnar result; sections are memory-mapped and read on demand"""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Open Analysis Result",
+            "",
+            "DNA Result Files (*.dnar);;All Files (*)"
+        )
+        if not file_path:
+            return
+        from result_file import load_result
+
+        try:
+            result = load_result(file_path)
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "Error", f"Could not open {os.path.basename(file_path)}: {str(e)}")
+            return
+        self.display_loaded_result(result, os.path.basename(file_path))
+
+    def display_loaded_result(self, result, name):
+        """Show a saved result, reading only the parts of the file that are displayed"""
+        header = result.header
+        n, m = header["mutated_length"], header["healthy_length"]
+        counts = header["op_counts"]
+        self.output.clear()
+        self.backtracking_output.clear()
+        self.last_analysis = None  # Loaded results are already saved
+        self.save_btn.setEnabled(False)
+        self.tab_widget.setCurrentIndex(0)
+
+        self.output.append(f"📂 SAVED RESULT: {name}")
+        self.output.append("═" * 60)
+        self.output.append(f"🔹 Mutated DNA Length: {n:,} base pairs")
+        self.output.append(f"🔹 Healthy DNA Length:  {m:,} base pairs")
+        self.output.append("")
+        self.output.append("👁️ SEQUENCE PREVIEW (First 100 bp)")
+        self.output.append("─" * 60)
+        self.output.append(f"Mutated: {result.sequence('mutated', 0, 100)}")
+        self.output.append(f"Healthy: {result.sequence('healthy', 0, 100)}")
+        self.output.append("")
+        self.output.append("🎯 ANALYSIS RESULTS")
+        self.output.append("═" * 60)
+        self.output.append(f"✅ Minimum mutation cost: {header['cost']}")
+        self.output.append("")
+        self.output.append("📈 MUTATION STATISTICS")
+        self.output.append("─" * 60)
+        total = counts["substitutions"] + counts["insertions"] + counts["deletions"]
+        self.output.append(f"Total Operations: {total:,}")
+        self.output.append(f"  • Substitutions: {counts['substitutions']:,}")
+        self.output.append(f"  • Insertions:    {counts['insertions']:,}")
+        self.output.append(f"  • Deletions:     {counts['deletions']:,}")
+        self.output.append("")
+
+        # First 20 steps: only the packed bytes holding a non-match are decoded
+        self.output.append("🔄 MUTATION PATHWAY")
+        self.output.append("─" * 60)
+        events = result.first_events(20)
+        deletions = insertions = 0
+        for shown, (index, op) in enumerate(events, 1):
+            # Every op before this one consumed a mutated base unless it was an
+            # insertion, and a healthy base unless it was a deletion
+            i, j = index - insertions, index - deletions
+            if op == "X":
+                step = f"Substitute {result.sequence('mutated', i, i + 1)} → {result.sequence('healthy', j, j + 1)}"
+            elif op == "D":
+                step = f"Delete {result.sequence('mutated', i, i + 1)}"
+                deletions += 1
+            else:
+                step = f"Insert {result.sequence('healthy', j, j + 1)}"
+                insertions += 1
+            self.output.append(f"{shown:3}. {step}")
+        shown = len(events)
+        if total > shown:
+            self.output.append(f"... and {total - shown} more steps")
+
+        # Hotspot plot from the precomputed density section
+        window = header["density_window"]
+        self.density_result = (result.section("density"), window, m)
+        self.export_density_btn.setEnabled(True)
+        self.density_header.setText(f"Mutation Density ({window} bp windows):")
+        self.plot_density(result.section("density"), window)
+
+        # DP table tab from the downsampled preview, if the file has one
+        self.display_dp_preview_section(result.section("dp_preview"), header.get("dp_step", 1), max_size=15)
+        self.update_status(f"Loaded result {name} - mutation cost: {header['cost']}", "success")
+
+    def display_dp_preview_section(self, preview, step, max_size=15):
+        """Fill the DP table tab from a downsampled DP matrix (every `step`-th cell)"""
+        if preview is None:
+            self.dp_table_widget.setRowCount(0)
+            self.dp_table_widget.setColumnCount(0)
+            return
+        rows, cols = min(preview.shape[0], max_size), min(preview.shape[1], max_size)
+        self.dp_table_widget.setRowCount(rows)
+        self.dp_table_widget.setColumnCount(cols)
+        # Headers show the real DP coordinates of each sampled cell
+        self.dp_table_widget.setHorizontalHeaderLabels([str(j * step) for j in range(cols)])
+        self.dp_table_widget.setVerticalHeaderLabels([str(i * step) for i in range(rows)])
+        for i in range(rows):
+            for j in range(cols):
+                item = QTableWidgetItem(str(int(preview[i, j])))
+                item.setTextAlignment(Qt.AlignCenter)
+                self.dp_table_widget.setItem(i, j, item)
+        self.dp_table_widget.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.dp_table_widget.verticalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+
     def visualize_step(self, i, j, action):
         """Visualize backtracking steps with highlighting in the backtracking tab"""
         # Append step information to backtracking output
@@ -659,12 +920,14 @@ class DNAMutationGUI(QWidget):
         # Check all characters are valid DNA bases
         return all(c in "ACGT" for c in seq)
     
+    @profiled("read")
     def read_dna_from_file(self, file_path):
         """Read DNA sequence from file, handling FASTA format"""
         try:
             # Read file content and convert to uppercase
             with open(file_path, "r") as f:
                 content = f.read().upper()
+            count(nbytes=len(content))
             
             # Split into lines and process
             lines = content.split('\n')
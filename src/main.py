@@ -1,73 +1,407 @@
-from dp_model import compute_dp_table
-from backtracking import reconstruct_path
-from visualization import print_dp_table, print_choice_table
+from dp_model import compute_dp_table, compute_pred_masks
+from backtracking import (reconstruct_path, reconstruct_ops, reconstruct_ops_from_masks, count_optimal_paths,
+                          enumerate_optimal_paths)
+from visualization import print_dp_table, print_choice_table, FORMATTERS, format_batch
+from profiling import phase, instrument, cprofile_to
+import argparse
 import os
+import sys
 
 def read_dna_file(filename):
     # Reads a DNA sequence from a text file.
-    sequence = ""
+    parts = []
     try:
-        with open(filename, 'r') as f:
+        with phase("read") as record, open(filename, 'r') as f:
             for line in f:
                 line = line.strip()
                 # Skip empty lines or FASTA headers
                 if not line or line.startswith(">"):
                     continue
-                # Append sequence line + Converts all characters to uppercase
-                sequence += line.upper()
+                # Collect sequence line + Converts all characters to uppercase
+                parts.append(line.upper())
+            sequence = "".join(parts)
+            if record is not None:
+                record["bytes"] = f.tell()
         return sequence
     except FileNotFoundError:
-        print(f"Error: The file '{filename}' was not found.")
+        print(f"Error: The file '{filename}' was not found.", file=sys.stderr)
         return None
 
-def main():
-    # Get the directory of the file
+def read_dna_records(filename):
+    # Reads several DNA sequences from one file: FASTA records, or one sequence
+    # per line when the file has no '>' headers. Returns [(name, sequence), ...]
+    records = []
+    name, parts = None, []
+    try:
+        with phase("read") as record, open(filename, 'r') as f:
+            for number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                if line.startswith(">"):
+                    if name is not None:
+                        records.append((name, "".join(parts)))
+                    name, parts = line[1:].strip() or f"record{len(records) + 1}", []
+                elif name is None:
+                    records.append((f"line{number}", line.upper()))
+                else:
+                    parts.append(line.upper())
+            if name is not None:
+                records.append((name, "".join(parts)))
+            if record is not None:
+                record["bytes"] = f.tell()
+        return records
+    except FileNotFoundError:
+        print(f"Error: The file '{filename}' was not found.", file=sys.stderr)
+        return None
+
+def iter_dna_chunks(filename):
+    # Yields the sequence lines of a DNA file as they are read ('-' = stdin),
+    # skipping blank lines and FASTA headers
+    f = sys.stdin if filename == "-" else open(filename, 'r')
+    try:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith(">"):
+                yield line.upper()
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+# Engines: name -> function(mutated_DNA, healthy_DNA, ins, del, sub) -> dict
+# Every engine returns at least "cost" and "ops" (op-code string, see backtracking.reconstruct_ops)
+def run_choice_engine(mutated_DNA, healthy_DNA, ins_cost, del_cost, sub_cost):
+    n, m = len(mutated_DNA), len(healthy_DNA)
+    dp, choice = compute_dp_table(mutated_DNA, healthy_DNA, ins_cost, del_cost, sub_cost)
+    ops = reconstruct_ops(choice, n, m)
+    return {"cost": dp[n][m], "ops": ops, "dp": dp, "choice": choice}
+
+def run_masks_engine(mutated_DNA, healthy_DNA, ins_cost, del_cost, sub_cost):
+    n, m = len(mutated_DNA), len(healthy_DNA)
+    dp, pred = compute_pred_masks(mutated_DNA, healthy_DNA, ins_cost, del_cost, sub_cost)
+    ops = reconstruct_ops_from_masks(pred, mutated_DNA, healthy_DNA)
+    optimal_paths = count_optimal_paths(pred)
+    return {"cost": dp[n][m], "ops": ops, "dp": dp, "pred": pred, "optimal_paths": optimal_paths}
+
+def run_numpy_engine(mutated_DNA, healthy_DNA, ins_cost, del_cost, sub_cost):
+    from numpy_batch import align_batch_numpy, unpack_ops  # NumPy only loaded for this engine
+
+    costs, tracebacks = align_batch_numpy([(mutated_DNA, healthy_DNA)], ins_cost, del_cost, sub_cost,
+                                          with_traceback=True)
+    ops = unpack_ops(tracebacks[0], mutated_DNA, healthy_DNA)
+    return {"cost": int(costs[0]), "ops": ops}
+
+ENGINES = {
+    "python": run_choice_engine,
+    "masks": run_masks_engine,
+    "numpy": run_numpy_engine,
+}
+
+
+def build_parser():
     script_dir = os.path.dirname(os.path.abspath(__file__))
-   
     base_dir = os.path.dirname(script_dir)
-    # Define file paths for sequences
-    file_healthy = os.path.join(base_dir, "Sequences", "Small_Example_healthy.txt")
-    file_mutated = os.path.join(base_dir, "Sequences", "Small_Example_mutated.txt")
-    print(f"Reading sequences from files...")
+    # Default to the small example so `python main.py` keeps working without arguments
+    default_healthy = os.path.join(base_dir, "Sequences", "Small_Example_healthy.txt")
+    default_mutated = os.path.join(base_dir, "Sequences", "Small_Example_mutated.txt")
+
+    parser = argparse.ArgumentParser(description="Reconstruct the minimum-cost mutation pathway between two DNA sequences.")
+    parser.add_argument("--healthy", default=default_healthy, help="healthy DNA file (plain text or FASTA)")
+    parser.add_argument("--mutated", default=default_mutated, help="mutated DNA file (plain text or FASTA)")
+    parser.add_argument("--ins-cost", type=int, default=2, help="insertion cost (default: 2)")
+    parser.add_argument("--del-cost", type=int, default=2, help="deletion cost (default: 2)")
+    parser.add_argument("--sub-cost", type=int, default=1, help="substitution cost (default: 1)")
+    parser.add_argument("--batch", action="store_true",
+                        help="treat --mutated as many samples (FASTA records or one per line) "
+                             "aligned against --healthy with shared-prefix row reuse")
+    parser.add_argument("--max-cost", type=int, default=None, metavar="T",
+                        help="with --batch, skip samples whose cost lower bound exceeds T "
+                             "and report only samples with cost <= T")
+    parser.add_argument("--save", metavar="FILE",
+                        help="save sequences, costs, packed ops, density and a downsampled DP table "
+                             "to a binary .dnar result file (open it in the GUI)")
+    parser.add_argument("--density-out", metavar="FILE",
+                        help="write per-window mutation counts along the healthy sequence as TSV")
+    parser.add_argument("--density-window", type=int, default=100, metavar="W",
+                        help="window size in healthy bases for --density-out (default: 100)")
+    parser.add_argument("--stream", action="store_true",
+                        help="align --mutated (or '-' for stdin) progressively as it is read, "
+                             "keeping only the frontier row and checkpoints")
+    parser.add_argument("--checkpoint-interval", type=int, default=None, metavar="R",
+                        help="with --stream, save a DP row every R rows "
+                             "(default: adaptive, about sqrt of the stream length)")
+    parser.add_argument("--paths", type=int, default=None, metavar="K",
+                        help="with --engine masks, also list up to K co-optimal pathways")
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="python",
+                        help="DP engine; 'masks' also counts co-optimal pathways, "
+                             "'numpy' vectorizes rows (with --batch: one lane per sample)")
+    parser.add_argument("--format", choices=sorted(FORMATTERS), default="text", help="output format")
+    parser.add_argument("-o", "--output", help="write results to this file instead of stdout")
+    parser.add_argument("--show-tables", action="store_true",
+                        help="also print the DP (and choice) tables (to stderr unless --format text)")
+    parser.add_argument("--steps", action="store_true",
+                        help="print every backtracking step (slow; --engine python only; "
+                             "goes to stderr unless --format text)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="suppress progress messages")
+    parser.add_argument("--timings", action="store_true",
+                        help="report phase timings, cell counts and throughput on stderr")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="with --timings, also report allocations via tracemalloc (much slower)")
+    parser.add_argument("--profile", nargs="?", const="-", metavar="FILE",
+                        help="run under cProfile; print stats to stderr, or dump them to FILE")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.density_window < 1:
+        parser.error("--density-window must be at least 1")
+    if min(args.ins_cost, args.del_cost, args.sub_cost) < 0:
+        # The DP tie-breaks, the lower bounds and the early exits all assume non-negative costs
+        parser.error("--ins-cost, --del-cost and --sub-cost must not be negative")
+    if args.steps and args.engine != "python":
+        parser.error("--steps needs the choice table of --engine python")
+    if args.paths is not None:
+        if args.engine != "masks" or args.batch or args.stream:
+            parser.error("--paths needs the predecessor masks of --engine masks (single pair)")
+        if args.paths < 1:
+            parser.error("--paths must be at least 1")
+    if args.batch:
+        if args.engine == "masks":
+            parser.error("--batch supports --engine python (shared prefixes) or numpy (one lane per sample)")
+        if args.show_tables or args.steps:
+            parser.error("--batch keeps no full DP table; --show-tables and --steps are not supported")
+    if args.max_cost is not None and not args.batch:
+        parser.error("--max-cost requires --batch")
+    if args.density_out and args.batch:
+        parser.error("--density-out reports a single alignment and cannot be used with --batch")
+    if args.save and args.batch:
+        parser.error("--save stores a single alignment and cannot be used with --batch")
+    if args.stream:
+        if args.batch:
+            parser.error("--stream and --batch cannot be combined")
+        if args.engine != "python":
+            parser.error("--stream uses its own row engine; --engine is not supported")
+        if args.show_tables or args.steps:
+            parser.error("--stream keeps no DP table; --show-tables and --steps are not supported")
+    if args.checkpoint_interval is not None:
+        if not args.stream:
+            parser.error("--checkpoint-interval requires --stream")
+        if args.checkpoint_interval < 1:
+            parser.error("--checkpoint-interval must be at least 1")
+
+    if args.profile:
+        with cprofile_to(args.profile):
+            return run_with_timings(args)
+    return run_with_timings(args)
+
+
+def run_with_timings(args):
+    if not args.timings:
+        return run(args)
+    with instrument(track_memory=args.trace_memory) as profiler:
+        status = run(args)
+    sys.stderr.write(profiler.format_report())
+    return status
+
+
+def run(args):
+    def log(message):
+        # Progress messages go to stderr so machine-readable stdout stays clean
+        if not args.quiet:
+            print(message, file=sys.stderr)
+
+    log("Reading sequences from files...")
+
+    if args.batch:
+        return run_batch(args, log)
+    if args.stream:
+        return run_stream(args, log)
 
     # Read sequences from files
-    healthy_DNA = read_dna_file(file_healthy)
-    mutated_DNA = read_dna_file(file_mutated)
+    healthy_DNA = read_dna_file(args.healthy)
+    mutated_DNA = read_dna_file(args.mutated)
 
     # Check if files were read successfully
     if healthy_DNA is None or mutated_DNA is None:
-        print("Aborting due to file error.")
-        return
+        print("Aborting due to file error.", file=sys.stderr)
+        return 1
 
     # Check if files are empty
     if not healthy_DNA or not mutated_DNA:
-        print("Error: One or both of the DNA files are empty.")
-        return
+        print("Error: One or both of the DNA files are empty.", file=sys.stderr)
+        return 1
     # Display sequence lengths
-    print(f"Healthy Sequence Length: {len(healthy_DNA)}")
-    print(f"Mutated Sequence Length: {len(mutated_DNA)}")
-    # Define mutation costs
-    ins_cost = 2
-    del_cost = 2
-    sub_cost = 1
-
-    
-    dp, choice = compute_dp_table(mutated_DNA, healthy_DNA, ins_cost, del_cost, sub_cost)
-    # Display DP table
-    print_dp_table(dp)  
-    # Display Choice table 
-    print_choice_table(choice) 
-    # Reconstruct mutation steps using backtracking
-    steps = reconstruct_path(choice, mutated_DNA, healthy_DNA)
-
-    # Display final mutation cost
-    print("\nMinimum Mutation Cost:", dp[len(mutated_DNA)][len(healthy_DNA)])
-    # Display mutation steps
-    print("\nMutation Steps:")
-    for step in steps:
-        print("-", step)
-
-    
+    log(f"Healthy Sequence Length: {len(healthy_DNA)}")
+    log(f"Mutated Sequence Length: {len(mutated_DNA)}")
+
+    result = ENGINES[args.engine](mutated_DNA, healthy_DNA, args.ins_cost, args.del_cost, args.sub_cost)
+    if args.paths is not None:
+        # Distinct co-optimal histories as op-code strings, default pathway first
+        result["paths"] = list(enumerate_optimal_paths(result["pred"], mutated_DNA, healthy_DNA, limit=args.paths))
+    result.update({
+        "mutated_DNA": mutated_DNA,
+        "healthy_DNA": healthy_DNA,
+        "mutated_file": args.mutated,
+        "healthy_file": args.healthy,
+        "costs": {"ins": args.ins_cost, "del": args.del_cost, "sub": args.sub_cost},
+    })
+
+    # All output goes through one buffered stream and is written in large blocks
+    out = open(args.output, "w", buffering=1 << 20) if args.output else sys.stdout
+    try:
+        with phase("render"):
+            # Keep machine-readable output parseable: tables and trace go to stderr for json/tsv/cigar
+            trace_out = out if args.format == "text" else sys.stderr
+            if args.show_tables and "dp" in result:
+                print_dp_table(result["dp"], trace_out)
+                if "choice" in result:
+                    print_choice_table(result["choice"], trace_out)
+            if args.steps:
+                reconstruct_path(result["choice"], mutated_DNA, healthy_DNA, out=trace_out)
+            out.write(FORMATTERS[args.format](result))
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    write_density(args, result)
+    save_binary(args, result)
+    return 0
+
+
+def write_density(args, result):
+    # Hotspot report: one pass over the op codes, per-window counts as a NumPy array
+    if not args.density_out:
+        return
+    from density import density_from_ops, format_density_tsv
+
+    healthy_length = len(result["healthy_DNA"])
+    with phase("density", cells=len(result["ops"])):
+        counts, _ = density_from_ops(result["ops"], healthy_length, args.density_window)
+        with open(args.density_out, "w") as f:
+            f.write(format_density_tsv(counts, args.density_window, healthy_length))
+
+
+def save_binary(args, result):
+    if not args.save:
+        return
+    from result_file import save_result
+
+    with phase("save"):
+        save_result(args.save, result["mutated_DNA"], result["healthy_DNA"], result["ops"],
+                    result["cost"], result["costs"], dp=result.get("dp"),
+                    density_window=args.density_window)
+
+
+def run_batch(args, log):
+    from batch import align_batch_shared_prefix
+
+    healthy_DNA = read_dna_file(args.healthy)
+    samples = read_dna_records(args.mutated)
+    if healthy_DNA is None or samples is None:
+        print("Aborting due to file error.", file=sys.stderr)
+        return 1
+    if not healthy_DNA or not samples:
+        print("Error: The healthy DNA file or the sample file is empty.", file=sys.stderr)
+        return 1
+    log(f"Healthy Sequence Length: {len(healthy_DNA)}")
+    log(f"Samples: {len(samples)}")
+
+    total = len(samples)
+    if args.max_cost is not None:
+        from prefilter import bound_pairs
+
+        # Lower bounds only drop samples; the survivors get exactly one DP below
+        bounds = bound_pairs(((seq, healthy_DNA) for _, seq in samples),
+                             args.ins_cost, args.del_cost, args.sub_cost)
+        samples = [sample for sample, bound in zip(samples, bounds) if bound <= args.max_cost]
+    pruned = total - len(samples)
+
+    sequences = [seq for _, seq in samples]
+    if args.engine == "numpy":
+        results = run_batch_numpy(healthy_DNA, sequences, args)
+    else:
+        # With --max-cost, trie branches whose rows are all above it are abandoned early
+        results, rows_computed = align_batch_shared_prefix(
+            healthy_DNA, sequences, args.ins_cost, args.del_cost, args.sub_cost, max_cost=args.max_cost)
+        log(f"DP rows computed: {rows_computed:,} of {sum(map(len, sequences)):,} (shared prefixes reused)")
+
+    kept = []
+    for (name, seq), result in zip(samples, results):
+        if result["cost"] is None or (args.max_cost is not None and result["cost"] > args.max_cost):
+            continue
+        result.update({"name": name, "mutated_DNA": seq, "healthy_DNA": healthy_DNA})
+        kept.append(result)
+    results = kept
+    if args.max_cost is not None:
+        # Always reported (even with -q): the output alone cannot tell which samples were dropped
+        print(f"Pre-filter: {total:,} samples, {pruned:,} pruned by lower bound, "
+              f"{len(samples) - len(results):,} over cost {args.max_cost} after the DP, "
+              f"{len(results):,} kept", file=sys.stderr)
+
+    out = open(args.output, "w", buffering=1 << 20) if args.output else sys.stdout
+    try:
+        with phase("render"):
+            out.write(format_batch(results, args.format))
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+def run_batch_numpy(healthy_DNA, sequences, args):
+    from numpy_batch import iter_batch_numpy, unpack_ops
+
+    # Tracebacks are decoded chunk by chunk, so only one chunk of them is ever in memory
+    pairs = [(seq, healthy_DNA) for seq in sequences]
+    results = []
+    for start, costs, tracebacks in iter_batch_numpy(pairs, args.ins_cost, args.del_cost, args.sub_cost,
+                                                     with_traceback=True):
+        results.extend({"cost": int(cost), "ops": unpack_ops(packed, seq, healthy_DNA)}
+                       for cost, packed, seq in zip(costs, tracebacks, sequences[start:]))
+    return results
+
+
+def run_stream(args, log):
+    from streaming import align_stream
+
+    healthy_DNA = read_dna_file(args.healthy)
+    if not healthy_DNA:
+        print("Error: The healthy DNA file is missing or empty.", file=sys.stderr)
+        return 1
+    log(f"Healthy Sequence Length: {len(healthy_DNA)}")
+
+    try:
+        for result in align_stream(iter_dna_chunks(args.mutated), healthy_DNA,
+                                   args.ins_cost, args.del_cost, args.sub_cost,
+                                   args.checkpoint_interval):
+            if not result.get("done"):
+                log(f"  {result['rows']:,} bases received, running cost {result['cost']}")
+    except FileNotFoundError:
+        print(f"Error: The file '{args.mutated}' was not found.", file=sys.stderr)
+        return 1
+    if not result["mutated_DNA"]:
+        print("Error: The mutated DNA stream is empty.", file=sys.stderr)
+        return 1
+
+    result.update({
+        "healthy_DNA": healthy_DNA,
+        "mutated_file": args.mutated,
+        "healthy_file": args.healthy,
+        "costs": {"ins": args.ins_cost, "del": args.del_cost, "sub": args.sub_cost},
+    })
+    out = open(args.output, "w", buffering=1 << 20) if args.output else sys.stdout
+    try:
+        with phase("render"):
+            out.write(FORMATTERS[args.format](result))
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    write_density(args, result)
+    save_binary(args, result)
+    return 0
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,164 @@
+"""
+Vectorized DP for many short pairs at once (one NumPy lane per pair).
+
+All pairs of a chunk are padded into 2D code arrays and the DP advances
+one row for every lane with a handful of array operations. The insert
+dependency inside a row (row[j] needs row[j-1]) is removed with the
+prefix-minimum identity
+
+    row[j] = min over k <= j of (t[k] + (j - k) * ins_cost)
+           = j * ins_cost + cummin(t[k] - k * ins_cost)
+
+where t = min(diagonal, up). Padding never affects a lane: its cost is
+read at (len(mutated), len(healthy)) and the DP never looks to the right
+or below that cell.
+
+Tracebacks (optional) are packed as 2-bit codes, four cells per byte.
+A chunk's tracebacks take (lanes, N+1, ceil((M+1)/4)) bytes, so callers
+that need every pathway should consume iter_batch_numpy chunk by chunk
+(decode with unpack_ops, then drop the chunk) rather than collect them all.
+NumPy is imported with this module, so import it lazily from entry points.
+"""
+
+import numpy as np
+
+from backtracking import OP_MATCH, OP_SUBSTITUTE, OP_DELETE, OP_INSERT
+from profiling import profiled, count, phase
+
+# 2-bit traceback codes (same sub > delete > insert tie-break as compute_dp_table)
+TB_DIAG = 0
+TB_UP = 1
+TB_LEFT = 2
+
+_MUTATED_PAD = 254  # padding codes differ so padded cells never "match"
+_HEALTHY_PAD = 255
+
+
+def _encode(sequences, width, pad):
+    # Pack a list of strings into a (len(sequences), width) uint8 array
+    codes = np.full((len(sequences), width), pad, dtype=np.uint8)
+    for lane, seq in enumerate(sequences):
+        if seq:
+            codes[lane, :len(seq)] = np.frombuffer(seq.encode("ascii"), dtype=np.uint8)
+    return codes
+
+
+def _pack_2bit(codes):
+    # (B, W) array of 2-bit codes -> (B, ceil(W / 4)) bytes
+    lanes, width = codes.shape
+    padded = np.zeros((lanes, -(-width // 4) * 4), dtype=np.uint8)
+    padded[:, :width] = codes
+    quads = padded.reshape(lanes, -1, 4)
+    return quads[:, :, 0] | (quads[:, :, 1] << 2) | (quads[:, :, 2] << 4) | (quads[:, :, 3] << 6)
+
+
+def _align_chunk(mutated, healthy, ins_cost, del_cost, sub_cost, with_traceback, dtype):
+    lanes = len(mutated)
+    n_lens = np.array([len(s) for s in mutated], dtype=np.int64)
+    m_lens = np.array([len(s) for s in healthy], dtype=np.int64)
+    N, M = int(n_lens.max()), int(m_lens.max())
+    lane_index = np.arange(lanes)
+
+    mut_codes = _encode(mutated, N, _MUTATED_PAD)
+    hea_codes = _encode(healthy, M, _HEALTHY_PAD)
+
+    cols = np.arange(M + 1, dtype=dtype)
+    ins_ramp = cols * ins_cost                          # j * ins_cost
+    row = np.broadcast_to(ins_ramp, (lanes, M + 1)).copy()   # row 0
+
+    costs = np.zeros(lanes, dtype=dtype)
+    done = n_lens == 0
+    costs[done] = row[done, m_lens[done]]
+
+    traceback = None
+    if with_traceback:
+        traceback = np.zeros((lanes, N + 1, -(-(M + 1) // 4)), dtype=np.uint8)
+        first = np.full((lanes, M + 1), TB_LEFT, dtype=np.uint8)
+        traceback[:, 0] = _pack_2bit(first)
+
+    for i in range(1, N + 1):
+        mismatch = mut_codes[:, i - 1:i] != hea_codes       # (lanes, M)
+        diag = row[:, :-1] + mismatch * dtype(sub_cost)
+        up = row[:, 1:] + dtype(del_cost)
+        t = np.minimum(diag, up)
+
+        new_row = np.empty_like(row)
+        new_row[:, 0] = i * del_cost
+        # Resolve the left-to-right insert chain with a prefix minimum
+        shifted = np.concatenate((new_row[:, :1], t), axis=1) - ins_ramp
+        new_row[:] = np.minimum.accumulate(shifted, axis=1) + ins_ramp
+
+        if with_traceback:
+            codes = np.full((lanes, M + 1), TB_LEFT, dtype=np.uint8)
+            codes[:, 0] = TB_UP
+            body = new_row[:, 1:]
+            codes[:, 1:][body == up] = TB_UP
+            codes[:, 1:][body == diag] = TB_DIAG      # diagonal wins ties, as in compute_dp_table
+            traceback[:, i] = _pack_2bit(codes)
+
+        row = new_row
+        finished = n_lens == i
+        if finished.any():
+            costs[finished] = row[lane_index[finished], m_lens[finished]]
+
+    return costs, traceback
+
+
+def iter_batch_numpy(pairs, ins_cost, del_cost, sub_cost, with_traceback=False,
+                     chunk_size=4096, dtype=np.int32):
+    # Generator over chunks of pairs (list of (mutated_DNA, healthy_DNA)):
+    # yields (start, costs, tracebacks) for pairs[start:start + len(costs)];
+    # tracebacks is the chunk's packed (lanes, N+1, ceil((M+1)/4)) array, or None.
+    # Only the chunk being consumed is alive, so peak memory is one chunk.
+    for start in range(0, len(pairs), chunk_size):
+        chunk = pairs[start:start + chunk_size]
+        with phase("fill"):
+            chunk_costs, chunk_tb = _align_chunk(
+                [p[0] for p in chunk], [p[1] for p in chunk],
+                ins_cost, del_cost, sub_cost, with_traceback, dtype)
+            count(cells=sum(len(a) * len(b) for a, b in chunk))
+        yield start, chunk_costs, chunk_tb
+
+
+def align_batch_numpy(pairs, ins_cost, del_cost, sub_cost, with_traceback=False,
+                      chunk_size=4096, dtype=np.int32):
+    # pairs: list of (mutated_DNA, healthy_DNA).
+    # Returns costs (int array, one per pair) and, if with_traceback, a list of
+    # packed traceback arrays (one (N+1, ceil((M+1)/4)) uint8 array per pair,
+    # padded to the largest pair of its chunk); decode with unpack_ops.
+    # All tracebacks stay in memory: for large batches use iter_batch_numpy.
+    costs = np.zeros(len(pairs), dtype=dtype)
+    tracebacks = [] if with_traceback else None
+    for start, chunk_costs, chunk_tb in iter_batch_numpy(pairs, ins_cost, del_cost, sub_cost,
+                                                          with_traceback, chunk_size, dtype):
+        costs[start:start + len(chunk_costs)] = chunk_costs
+        if with_traceback:
+            tracebacks.extend(chunk_tb)
+    return costs, tracebacks
+
+
+@profiled("traceback")
+def unpack_ops(packed, mutated_DNA, healthy_DNA):
+    # Walk one packed traceback back from (n, m) and return the op-code string
+    # (same format as backtracking.reconstruct_ops)
+    i, j = len(mutated_DNA), len(healthy_DNA)
+    ops = []
+    while i > 0 or j > 0:
+        code = (int(packed[i, j >> 2]) >> ((j & 3) * 2)) & 3
+        if i == 0:
+            code = TB_LEFT
+        elif j == 0:
+            code = TB_UP
+        if code == TB_DIAG:
+            ops.append(OP_MATCH if mutated_DNA[i - 1] == healthy_DNA[j - 1] else OP_SUBSTITUTE)
+            i -= 1
+            j -= 1
+        elif code == TB_UP:
+            ops.append(OP_DELETE)
+            i -= 1
+        else:
+            ops.append(OP_INSERT)
+            j -= 1
+    count(cells=len(ops))
+    ops.reverse()
+    return "".join(ops)
@@ -0,0 +1,141 @@
+"""
+Cheap lower bounds on the compute_dp_table cost, for large-scale screening.
+
+Every bound is computed from per-sequence profiles (length, base counts,
+q-gram counts) that are built once per sequence and reused across pairs:
+
+  - length:      |n - m| deletions or insertions are unavoidable
+  - composition: bases the mutated sequence has too many of must be deleted
+                 or substituted away, missing bases inserted or substituted in
+  - q-gram:      one edit changes at most 2q entries of the q-gram profile
+                 (Ukkonen), so at least ceil(qgram_distance / 2q) edits happen
+
+All bounds assume non-negative costs. Pairs whose combined bound exceeds the
+threshold are pruned. bound_pairs only computes the bounds, for callers
+that run their own exact DP on the survivors (e.g. the shared-prefix batch
+with max_cost); screen_pairs also gives each survivor an exact DP that stops
+early as soon as a whole row is above the threshold.
+"""
+
+from dp_model import next_dp_row
+from profiling import profiled, count
+
+BASES = "ACGT"
+_BASE_INDEX = {base: k for k, base in enumerate(BASES)}
+
+
+class SequenceProfile:
+    """Length, A/C/G/T counts and q-gram counts of one sequence"""
+
+    __slots__ = ("length", "composition", "qgrams", "q")
+
+    def __init__(self, sequence, q=3):
+        self.length = len(sequence)
+        self.q = q
+        # composition[4] lumps every non-ACGT character together (still a valid bound)
+        self.composition = [sequence.count(base) for base in BASES]
+        self.composition.append(self.length - sum(self.composition))
+
+        # Dense q-gram count vector over ACGT (4**q entries); q-grams that
+        # contain any other character are skipped, which only weakens the bound
+        qgrams = [0] * (4 ** q)
+        code, valid, mask = 0, 0, 4 ** q
+        for base in sequence:
+            k = _BASE_INDEX.get(base)
+            if k is None:
+                valid = 0
+                continue
+            code = (code * 4 + k) % mask
+            valid += 1
+            if valid >= q:
+                qgrams[code] += 1
+        self.qgrams = qgrams
+
+
+def length_bound(mutated, healthy, ins_cost, del_cost):
+    # mutated/healthy are SequenceProfile objects
+    diff = mutated.length - healthy.length
+    return diff * del_cost if diff > 0 else -diff * ins_cost
+
+
+def composition_bound(mutated, healthy, ins_cost, del_cost, sub_cost):
+    surplus = deficit = 0
+    for have, want in zip(mutated.composition, healthy.composition):
+        if have > want:
+            surplus += have - want   # must be deleted or substituted away
+        else:
+            deficit += want - have   # must be inserted or substituted in
+    # One substitution fixes one surplus and one deficit base; use it when cheaper
+    paired = min(surplus, deficit) if sub_cost < ins_cost + del_cost else 0
+    return paired * sub_cost + (surplus - paired) * del_cost + (deficit - paired) * ins_cost
+
+
+def qgram_bound(mutated, healthy, ins_cost, del_cost, sub_cost):
+    if mutated.q != healthy.q:
+        raise ValueError("profiles were built with different q")
+    distance = sum(abs(a - b) for a, b in zip(mutated.qgrams, healthy.qgrams))
+    edits = -(-distance // (2 * mutated.q))   # ceil division
+    return edits * min(ins_cost, del_cost, sub_cost)
+
+
+def lower_bound(mutated, healthy, ins_cost, del_cost, sub_cost):
+    """Best (largest) of the three bounds; never exceeds the exact DP cost"""
+    return max(
+        length_bound(mutated, healthy, ins_cost, del_cost),
+        composition_bound(mutated, healthy, ins_cost, del_cost, sub_cost),
+        qgram_bound(mutated, healthy, ins_cost, del_cost, sub_cost),
+    )
+
+
+def bounded_cost(mutated_DNA, healthy_DNA, ins_cost, del_cost, sub_cost, threshold):
+    # Exact cost computed row by row; returns None as soon as every cell of a
+    # row exceeds threshold (costs never decrease from one row to the next)
+    row = [j * ins_cost for j in range(len(healthy_DNA) + 1)]
+    for i, base in enumerate(mutated_DNA, 1):
+        row, _ = next_dp_row(row, i, base, healthy_DNA, ins_cost, del_cost, sub_cost, with_choice=False)
+        if min(row) > threshold:
+            return None
+    return row[-1] if row[-1] <= threshold else None
+
+
+@profiled("prefilter")
+def bound_pairs(pairs, ins_cost, del_cost, sub_cost, q=3):
+    # pairs: iterable of (mutated_DNA, healthy_DNA).
+    # Returns the combined lower bound of every pair, in input order; no DP is run.
+    profiles = {}   # sequence -> SequenceProfile, so repeated sequences are profiled once
+
+    def profile(sequence):
+        cached = profiles.get(sequence)
+        if cached is None:
+            cached = profiles[sequence] = SequenceProfile(sequence, q)
+            count(nbytes=len(sequence))
+        return cached
+
+    return [lower_bound(profile(mutated_DNA), profile(healthy_DNA), ins_cost, del_cost, sub_cost)
+            for mutated_DNA, healthy_DNA in pairs]
+
+
+def screen_pairs(pairs, ins_cost, del_cost, sub_cost, threshold, q=3):
+    # pairs: iterable of (mutated_DNA, healthy_DNA).
+    # Returns (results, stats): one dict per pair in input order with
+    #   "bound": combined lower bound, "cost": exact cost or None,
+    #   "pruned": True if the lower bound alone ruled the pair out
+    # and stats counting pairs pruned by the filter and by the early-exit DP.
+    pairs = list(pairs)
+    bounds = bound_pairs(pairs, ins_cost, del_cost, sub_cost, q)
+
+    results = []
+    stats = {"pairs": 0, "pruned": 0, "aligned": 0, "over_threshold": 0}
+    for (mutated_DNA, healthy_DNA), bound in zip(pairs, bounds):
+        stats["pairs"] += 1
+        if bound > threshold:
+            stats["pruned"] += 1
+            results.append({"bound": bound, "cost": None, "pruned": True})
+            continue
+
+        stats["aligned"] += 1
+        cost = bounded_cost(mutated_DNA, healthy_DNA, ins_cost, del_cost, sub_cost, threshold)
+        if cost is None:
+            stats["over_threshold"] += 1
+        results.append({"bound": bound, "cost": cost, "pruned": False})
+    return results, stats
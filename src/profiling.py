@@ -0,0 +1,175 @@
+"""
+Opt-in instrumentation for the DP pipeline.
+
+Usage:
+    with instrument() as prof:
+        compute_dp_table(...)          # hooked with @profiled("fill")
+    print(prof.format_report())
+
+The DP, traceback and reader functions carry the hooks themselves
+(@profiled or phase()), and call count() with the work they really did,
+so every caller (CLI, GUI, service) gets the same phase data. When no
+instrument() block is active, the hooks cost one global lookup per call.
+"""
+
+import functools
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+_NULL_PHASE = nullcontext()
+_active = None  # Profiler currently collecting, or None when disabled
+
+
+class Profiler:
+    """Collects per-phase timings, work counters and (optionally) allocations"""
+
+    def __init__(self, callback=None, track_memory=False):
+        self.callback = callback          # called with each finished phase record
+        self.track_memory = track_memory  # use tracemalloc (slows Python allocations)
+        self.records = []
+        self._open = []  # records of the phases currently running (innermost last)
+
+    @contextmanager
+    def phase(self, name, cells=None, nbytes=None):
+        """Time one phase; cells/nbytes are the work units used for throughput"""
+        if self.track_memory:
+            tracemalloc.reset_peak()
+            mem_before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        record = {"phase": name, "cells": cells, "bytes": nbytes, "nested": bool(self._open)}
+        self._open.append(record)
+        try:
+            yield record  # callers may fill in cells/bytes once they are known
+        finally:
+            self._open.pop()
+            record["seconds"] = time.perf_counter() - start
+            if self.track_memory:
+                current, peak = tracemalloc.get_traced_memory()
+                record["alloc_bytes"] = current - mem_before
+                record["peak_bytes"] = peak - mem_before
+            self.records.append(record)
+            if self.callback is not None:
+                self.callback(record)
+
+    def report(self):
+        """Return one row per phase name (calls summed) with throughput figures added.
+
+        Nested calls get their own row, so e.g. a traceback run inside the GUI's
+        animated display is not merged with the silent traceback.
+        """
+        rows = {}
+        for record in self.records:
+            key = (record["phase"], record["nested"])
+            row = rows.get(key)
+            if row is None:
+                row = rows[key] = {"phase": record["phase"], "calls": 0, "seconds": 0.0,
+                                   "cells": 0, "bytes": 0, "nested": record["nested"]}
+            row["calls"] += 1
+            row["seconds"] += record["seconds"]
+            row["cells"] += record.get("cells") or 0
+            row["bytes"] += record.get("bytes") or 0
+            if "alloc_bytes" in record:
+                row["alloc_bytes"] = row.get("alloc_bytes", 0) + record["alloc_bytes"]
+                row["peak_bytes"] = max(row.get("peak_bytes", 0), record["peak_bytes"])
+        for row in rows.values():
+            seconds = row["seconds"]
+            if seconds > 0 and row["cells"]:
+                row["cells_per_sec"] = row["cells"] / seconds
+            if seconds > 0 and row["bytes"]:
+                row["bytes_per_sec"] = row["bytes"] / seconds
+        return list(rows.values())
+
+    def format_report(self):
+        """Human-readable table of the phase records"""
+        lines = ["Phase        Calls    Time (ms)           Work          Rate/s    Alloc (KiB)   Peak (KiB)"]
+        total = 0.0
+        for row in self.report():
+            # Nested phases (e.g. a traceback inside a batch fill) are not added to the total twice
+            if not row.get("nested"):
+                total += row["seconds"]
+            # Work is counted in DP cells, or in bytes for I/O phases
+            if row["cells"]:
+                work, rate = f"{row['cells']:,} cells", f"{row.get('cells_per_sec', 0):,.0f}"
+            elif row["bytes"]:
+                work, rate = f"{row['bytes']:,} B", f"{row.get('bytes_per_sec', 0):,.0f}"
+            else:
+                work, rate = "-", "-"
+            alloc = f"{row['alloc_bytes'] / 1024:,.1f}" if "alloc_bytes" in row else "-"
+            peak = f"{row['peak_bytes'] / 1024:,.1f}" if "peak_bytes" in row else "-"
+            name = "  " + row["phase"] if row["nested"] else row["phase"]
+            lines.append(f"{name:<11} {row['calls']:>6} {row['seconds'] * 1000:>12.2f} {work:>14} "
+                         f"{rate:>15} {alloc:>14} {peak:>12}")
+        lines.append(f"{'total':<11} {'':>6} {total * 1000:>12.2f}")
+        return "\n".join(lines) + "\n"
+
+
+def phase(name, cells=None, nbytes=None):
+    """Instrumentation hook: records a phase if a Profiler is active, else no-op"""
+    if _active is None:
+        return _NULL_PHASE
+    return _active.phase(name, cells, nbytes)
+
+
+def count(cells=0, nbytes=0):
+    """Add the work actually done to the innermost running phase (no-op when disabled)"""
+    if _active is None or not _active._open:
+        return
+    record = _active._open[-1]
+    if cells:
+        record["cells"] = (record["cells"] or 0) + cells
+    if nbytes:
+        record["bytes"] = (record["bytes"] or 0) + nbytes
+
+
+def profiled(name):
+    """Decorator form of phase(): times every call of the function as phase `name`"""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _active is None:
+                return func(*args, **kwargs)
+            with _active.phase(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+@contextmanager
+def instrument(callback=None, track_memory=False):
+    """Activate a Profiler for the duration of the with-block"""
+    global _active
+    profiler = Profiler(callback, track_memory)
+    previous = _active
+    _active = profiler
+    started_tracing = track_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    try:
+        yield profiler
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+        _active = previous
+
+
+@contextmanager
+def cprofile_to(path, sort="cumulative", limit=30):
+    """Run the with-block under cProfile; '-' prints stats to stderr, else dumps a .prof file"""
+    import cProfile  # Only loaded when --profile is used
+    import io
+    import pstats
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        if path == "-":
+            stream = io.StringIO()
+            pstats.Stats(profiler, stream=stream).sort_stats(sort).print_stats(limit)
+            sys.stderr.write(stream.getvalue())
+        else:
+            profiler.dump_stats(path)
@@ -0,0 +1,176 @@
+"""
+Compact binary result files (.dnar) that open instantly via memory mapping.
+
+Layout:
+    8 bytes   magic b"DNAMUT01"
+    4 bytes   header length (little-endian uint32)
+    N bytes   JSON header: lengths, costs, op counts, section table
+    sections  raw arrays, each starting on a 64-byte boundary:
+                mutated / healthy   ASCII bases (uint8)
+                ops                 op codes packed 2 bits each, 4 per byte
+                density             per-window counts (int64, n_windows x 3)
+                dp_preview          DP matrix sampled every dp_step cells (int32), optional
+
+load_result only parses the header; every section is an np.memmap that
+the OS pages in when (and if) it is read, so multi-GB results open at once.
+"""
+
+import json
+import struct
+
+import numpy as np
+
+from density import density_from_ops
+
+MAGIC = b"DNAMUT01"
+_ALIGN = 64
+
+# 2-bit op codes; the order matches backtracking's '=', 'X', 'D', 'I'
+_OP_CHARS = b"=XDI"
+_OP_LOOKUP = np.zeros(256, dtype=np.uint8)
+for _code, _char in enumerate(_OP_CHARS):
+    _OP_LOOKUP[_char] = _code
+
+
+def pack_op_codes(ops):
+    # Op-code string -> uint8 array holding four 2-bit codes per byte
+    codes = _OP_LOOKUP[np.frombuffer(ops.encode("ascii"), dtype=np.uint8)]
+    padded = np.zeros(-(-len(codes) // 4) * 4, dtype=np.uint8)
+    padded[:len(codes)] = codes
+    quads = padded.reshape(-1, 4)
+    return quads[:, 0] | (quads[:, 1] << 2) | (quads[:, 2] << 4) | (quads[:, 3] << 6)
+
+
+def unpack_op_codes(packed, start, stop):
+    # Decode ops[start:stop] from a packed array, touching only the bytes needed
+    if stop <= start:
+        return ""
+    chunk = np.asarray(packed[start // 4:-(-stop // 4)])
+    codes = np.stack([(chunk >> shift) & 3 for shift in (0, 2, 4, 6)], axis=1).ravel()
+    offset = start % 4
+    return np.frombuffer(_OP_CHARS, dtype=np.uint8)[codes[offset:offset + stop - start]].tobytes().decode("ascii")
+
+
+def downsample_dp(dp, max_side=512):
+    # Every dp_step-th row and column, so the preview is at most max_side per side.
+    # Returns (preview int32 array, dp_step); pass it to save_result as dp_preview.
+    step = max(1, -(-max(len(dp), len(dp[0])) // max_side))
+    return np.array([row[::step] for row in dp[::step]], dtype=np.int32), step
+
+
+def save_result(path, mutated_DNA, healthy_DNA, ops, cost, costs, dp=None,
+                density_window=100, dp_max_side=512, dp_preview=None):
+    # Write one alignment result. costs: {"ins": .., "del": .., "sub": ..};
+    # dp (optional) is the full DP table, stored downsampled. Callers that do
+    # not keep the full table pass dp_preview=downsample_dp(dp) instead.
+    density, _ = density_from_ops(ops, len(healthy_DNA), density_window)
+    sections = [
+        ("mutated", np.frombuffer(mutated_DNA.encode("ascii"), dtype=np.uint8)),
+        ("healthy", np.frombuffer(healthy_DNA.encode("ascii"), dtype=np.uint8)),
+        ("ops", pack_op_codes(ops)),
+        ("density", density),
+    ]
+    header = {
+        "version": 1,
+        "mutated_length": len(mutated_DNA),
+        "healthy_length": len(healthy_DNA),
+        "cost": int(cost),
+        "costs": costs,
+        "n_ops": len(ops),
+        "op_counts": {"matches": ops.count("="), "substitutions": ops.count("X"),
+                      "deletions": ops.count("D"), "insertions": ops.count("I")},
+        "density_window": density_window,
+    }
+    if dp_preview is None and dp is not None:
+        dp_preview = downsample_dp(dp, dp_max_side)
+    if dp_preview is not None:
+        preview, step = dp_preview
+        sections.append(("dp_preview", preview))
+        header["dp_step"] = step
+
+    # Section offsets are relative to the end of the header block, so the
+    # header can be serialized once and then padded to the alignment
+    table, offset = {}, 0
+    for name, array in sections:
+        table[name] = {"offset": offset, "dtype": array.dtype.str, "shape": list(array.shape)}
+        offset += -(-array.nbytes // _ALIGN) * _ALIGN
+    header["sections"] = table
+    header_bytes = json.dumps(header).encode()
+    data_start = -(-(len(MAGIC) + 4 + len(header_bytes)) // _ALIGN) * _ALIGN
+
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(header_bytes)))
+        f.write(header_bytes)
+        for name, array in sections:
+            f.seek(data_start + table[name]["offset"])
+            f.write(np.ascontiguousarray(array).tobytes())
+        f.truncate(data_start + offset)
+
+
+class ResultFile:
+    """Header of a .dnar file plus lazily memory-mapped sections"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a DNA mutation result file")
+            (length,) = struct.unpack("<I", f.read(4))
+            self.header = json.loads(f.read(length))
+        self._data_start = -(-(len(MAGIC) + 4 + length) // _ALIGN) * _ALIGN
+        self._maps = {}
+
+    def section(self, name):
+        """Read-only np.memmap of one section (None if the file has no such section)"""
+        if name not in self._maps:
+            info = self.header["sections"].get(name)
+            if info is None:
+                return None
+            shape = tuple(info["shape"])
+            if 0 in shape:
+                array = np.zeros(shape, dtype=info["dtype"])   # mmap cannot map zero bytes
+            else:
+                array = np.memmap(self.path, dtype=info["dtype"], mode="r",
+                                  offset=self._data_start + info["offset"], shape=shape)
+            self._maps[name] = array
+        return self._maps[name]
+
+    def sequence(self, name, start=0, stop=None):
+        """Slice of the 'mutated' or 'healthy' sequence as a string"""
+        return self.section(name)[start:stop].tobytes().decode("ascii")
+
+    def ops(self, start=0, stop=None):
+        """Slice of the op-code string, decoded from the packed section"""
+        n_ops = self.header["n_ops"]
+        stop = n_ops if stop is None else min(stop, n_ops)
+        return unpack_op_codes(self.section("ops"), start, stop)
+
+    def first_events(self, limit=20, chunk=1 << 16):
+        """(op index, op code) of the first `limit` non-match ops, in order.
+
+        A packed byte is zero exactly when its four ops are all matches, so
+        NumPy skips those bytes and only the few non-zero ones are decoded.
+        """
+        packed = self.section("ops")
+        events = []
+        for start in range(0, len(packed), chunk):
+            block = np.asarray(packed[start:start + chunk])
+            for offset in np.flatnonzero(block).tolist():
+                byte = int(block[offset])
+                for slot in range(4):
+                    code = (byte >> (2 * slot)) & 3
+                    if code:
+                        events.append(((start + offset) * 4 + slot, chr(_OP_CHARS[code])))
+                        if len(events) == limit:
+                            return events
+        return events
+
+    def iter_ops(self, chunk=1 << 20):
+        """Op codes in chunks of `chunk` ops, for linear passes over huge results"""
+        for start in range(0, self.header["n_ops"], chunk):
+            yield self.ops(start, start + chunk)
+
+
+def load_result(path):
+    return ResultFile(path)
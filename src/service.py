@@ -0,0 +1,290 @@
+"""
+Local alignment service.
+
+A small asyncio HTTP server (TCP or Unix socket) that accepts sequence
+pairs, queues them and runs compute_dp_table/reconstruct_ops in a process
+pool, so several internal tools can share the cores of one machine.
+
+    POST /align   {"mutated": "ACGT...", "healthy": "ACGT...",
+                   "ins_cost": 2, "del_cost": 2, "sub_cost": 1, "timeout": 30}
+    GET  /health  queue and worker statistics
+
+Behaviour:
+  - backpressure: when the queue is full, new requests get 503 immediately
+  - timeouts: a request waiting longer than its timeout gets 504; a job that
+    is still queued when its last waiting client gives up is skipped (a job
+    already running in a worker finishes anyway)
+  - deduplication: identical requests already queued or running share one job
+  - size limit: pairs whose DP table exceeds max_cells get 413 before queuing
+  - worker failures: an error inside the job gets 500; if a worker process
+    dies (e.g. killed for memory), the pool is rebuilt for the next jobs
+  - workers come from a forkserver (spawn where unavailable), so they never
+    inherit the server's client sockets and "Connection: close" is honoured
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from visualization import ops_to_cigar, iter_op_records
+
+VALID_BASES = frozenset("ACGT")
+MAX_BODY_BYTES = 64 * 1024 * 1024  # Largest accepted request body
+MAX_CELLS = 10_000_000             # Largest accepted DP table, (n + 1) * (m + 1) cells
+
+_STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable",
+                504: "Gateway Timeout"}
+
+
+def align_job(mutated_DNA, healthy_DNA, ins_cost, del_cost, sub_cost):
+    """Worker-process entry point: cost, op-code string and phase timings for one pair"""
+    from dp_model import compute_dp_table
+    from backtracking import reconstruct_ops
+    from profiling import instrument
+
+    with instrument() as prof:
+        dp, choice = compute_dp_table(mutated_DNA, healthy_DNA, ins_cost, del_cost, sub_cost)
+        n, m = len(mutated_DNA), len(healthy_DNA)
+        ops = reconstruct_ops(choice, n, m)
+    return dp[n][m], ops, prof.report()
+
+
+def _new_executor(workers):
+    # Forking the serving process would hand its open client sockets to the workers
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+    return ProcessPoolExecutor(max_workers=workers, mp_context=context)
+
+
+class ServiceError(Exception):
+    """Error reported to the client with an HTTP status"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class AlignmentService:
+    """Request queue, dispatcher tasks and the process pool behind them"""
+
+    def __init__(self, workers=None, queue_size=64, default_timeout=60.0, max_cells=MAX_CELLS):
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.default_timeout = default_timeout
+        self.max_cells = max_cells
+        self.executor = None
+        self.queue = None
+        self.in_flight = {}      # request key -> asyncio.Future shared by identical requests
+        self.waiters = {}        # request key -> number of clients still waiting for it
+        self.dispatchers = []
+        self.stats = {"accepted": 0, "deduplicated": 0, "rejected": 0, "timed_out": 0, "completed": 0,
+                      "failed": 0, "pool_restarts": 0,
+                      "abandoned": 0}
+
+    async def start(self):
+        self.executor = _new_executor(self.workers)
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        # One dispatcher per worker process keeps exactly `workers` jobs running
+        self.dispatchers = [asyncio.create_task(self._dispatch()) for _ in range(self.workers)]
+
+    async def close(self):
+        for task in self.dispatchers:
+            task.cancel()
+        await asyncio.gather(*self.dispatchers, return_exceptions=True)
+        self.executor.shutdown(cancel_futures=True)
+
+    async def _dispatch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            key, future = await self.queue.get()
+            if not self.waiters.get(key):
+                # Every client timed out while the job was queued: do not run it
+                self.stats["abandoned"] += 1
+                self.in_flight.pop(key, None)
+                future.cancel()
+                self.queue.task_done()
+                continue
+            executor = self.executor
+            try:
+                result = await loop.run_in_executor(executor, align_job, *key)
+            except BrokenProcessPool:
+                # A worker died; every job on this pool fails, so replace it once
+                if self.executor is executor:
+                    self.executor = _new_executor(self.workers)
+                    self.stats["pool_restarts"] += 1
+                    executor.shutdown(wait=False)
+                self.stats["failed"] += 1
+                if not future.done():
+                    future.set_exception(ServiceError(500, "worker process died during the alignment"))
+            except Exception as e:
+                self.stats["failed"] += 1
+                if not future.done():
+                    future.set_exception(ServiceError(500, f"alignment failed: {e}"))
+            else:
+                if not future.done():
+                    future.set_result(result)
+                self.stats["completed"] += 1
+            finally:
+                self.in_flight.pop(key, None)
+                self.queue.task_done()
+
+    async def align(self, mutated_DNA, healthy_DNA, ins_cost, del_cost, sub_cost, timeout=None):
+        """Queue one pair (or join an identical in-flight one) and wait for it"""
+        cells = (len(mutated_DNA) + 1) * (len(healthy_DNA) + 1)
+        if cells > self.max_cells:
+            raise ServiceError(413, f"alignment needs {cells:,} DP cells, the limit is {self.max_cells:,}")
+        key = (mutated_DNA, healthy_DNA, ins_cost, del_cost, sub_cost)
+        future = self.in_flight.get(key)
+        if future is not None:
+            self.stats["deduplicated"] += 1
+        else:
+            future = asyncio.get_running_loop().create_future()
+            try:
+                self.queue.put_nowait((key, future))
+            except asyncio.QueueFull:
+                self.stats["rejected"] += 1
+                raise ServiceError(503, "alignment queue is full, retry later")
+            self.in_flight[key] = future
+            self.stats["accepted"] += 1
+
+        self.waiters[key] = self.waiters.get(key, 0) + 1
+        try:
+            # shield: one client timing out must not cancel the job for the others
+            cost, ops, timings = await asyncio.wait_for(asyncio.shield(future), timeout or self.default_timeout)
+        except asyncio.TimeoutError:
+            self.stats["timed_out"] += 1
+            raise ServiceError(504, "alignment timed out")
+        finally:
+            remaining = self.waiters[key] - 1
+            if remaining:
+                self.waiters[key] = remaining
+            else:
+                del self.waiters[key]
+
+        return {
+            "cost": cost,
+            "cigar": ops_to_cigar(ops),
+            "steps": [
+                {"op": name, "mutated_pos": i, "healthy_pos": j, "mutated_base": a, "healthy_base": b}
+                for name, i, j, a, b in iter_op_records(ops, mutated_DNA, healthy_DNA)
+            ],
+            "timings": timings,
+        }
+
+    def health(self):
+        return dict(self.stats, workers=self.workers, queued=self.queue.qsize(),
+                    queue_size=self.queue_size, in_flight=len(self.in_flight), max_cells=self.max_cells)
+
+    # --- HTTP handling -------------------------------------------------
+
+    async def handle_connection(self, reader, writer):
+        try:
+            status, payload = await self._handle_request(reader)
+        except ServiceError as e:
+            status, payload = e.status, {"error": str(e)}
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+            return
+        except Exception as e:
+            status, payload = 400, {"error": f"bad request: {e}"}
+
+        body = json.dumps(payload).encode()
+        writer.write(
+            f"HTTP/1.1 {status} {_STATUS_TEXT.get(status, '')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: close\r\n\r\n".encode() + body
+        )
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+        writer.close()
+
+    async def _handle_request(self, reader):
+        request_line = (await reader.readline()).decode("latin-1").split()
+        if len(request_line) < 2:
+            raise ServiceError(400, "malformed request line")
+        method, path = request_line[0], request_line[1]
+
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode("latin-1").strip()
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if path == "/health":
+            return 200, self.health()
+        if path != "/align":
+            raise ServiceError(404, f"unknown path {path}")
+        if method != "POST":
+            raise ServiceError(405, "use POST /align")
+
+        length = int(headers.get("content-length", 0))
+        if length > MAX_BODY_BYTES:
+            raise ServiceError(413, "request body too large")
+        request = json.loads(await reader.readexactly(length))
+
+        mutated_DNA = str(request.get("mutated", "")).upper()
+        healthy_DNA = str(request.get("healthy", "")).upper()
+        if not mutated_DNA or not healthy_DNA:
+            raise ServiceError(400, "both 'mutated' and 'healthy' sequences are required")
+        for name, seq in (("mutated", mutated_DNA), ("healthy", healthy_DNA)):
+            invalid = set(seq) - VALID_BASES
+            if invalid:
+                raise ServiceError(400, f"{name} DNA contains invalid characters: {''.join(sorted(invalid))}")
+
+        result = await self.align(
+            mutated_DNA, healthy_DNA,
+            int(request.get("ins_cost", 2)), int(request.get("del_cost", 2)), int(request.get("sub_cost", 1)),
+            timeout=float(request["timeout"]) if request.get("timeout") else None,
+        )
+        return 200, result
+
+
+async def serve(service, host="127.0.0.1", port=8765, unix_path=None):
+    await service.start()
+    if unix_path:
+        server = await asyncio.start_unix_server(service.handle_connection, path=unix_path)
+        where = unix_path
+    else:
+        server = await asyncio.start_server(service.handle_connection, host, port)
+        where = f"http://{host}:{port}"
+    print(f"Alignment service listening on {where} ({service.workers} workers)", file=sys.stderr)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve DNA mutation pathway alignments over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1", help="TCP address to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="TCP port (default: 8765)")
+    parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--queue-size", type=int, default=64, help="max queued jobs before 503 (default: 64)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="default per-request timeout in seconds")
+    parser.add_argument("--max-cells", type=int, default=MAX_CELLS,
+                        help=f"largest DP table accepted, (n + 1) * (m + 1) (default: {MAX_CELLS:,})")
+    args = parser.parse_args(argv)
+
+    service = AlignmentService(args.workers, args.queue_size, args.timeout, args.max_cells)
+    try:
+        asyncio.run(serve(service, args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
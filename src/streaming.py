@@ -0,0 +1,128 @@
+"""
+Progressive alignment of a mutated sequence that arrives in chunks.
+
+The healthy reference is known up front; each chunk of the mutated
+sequence extends the DP table by one row per base. Only the frontier row
+is kept, plus a checkpoint row every `checkpoint_interval` rows (stored as
+array('q'), 8 bytes per cell). When the stream ends, the pathway is
+recovered block by block from the last checkpoint backwards, recomputing
+the choice rows of one block at a time.
+
+Memory: O(m * (n / interval + interval)) instead of O(n * m). With
+checkpoint_interval=None (the default) the interval starts small and
+doubles whenever there are more checkpoints than rows per block, dropping
+every other checkpoint, so it stays close to sqrt(n) and memory to
+O(m * sqrt(n)) without knowing the stream length in advance.
+"""
+
+from array import array
+
+from dp_model import initial_dp_row, next_dp_row
+from backtracking import OP_MATCH, OP_SUBSTITUTE, OP_DELETE, OP_INSERT
+from profiling import profiled, count
+
+_INITIAL_INTERVAL = 64  # starting interval of the adaptive mode
+
+_ACTION_MOVES = {"MATCH": (OP_MATCH, 1, 1), "SUBSTITUTE": (OP_SUBSTITUTE, 1, 1),
+                 "DELETE": (OP_DELETE, 1, 0), "INSERT": (OP_INSERT, 0, 1)}
+
+
+class StreamingAligner:
+    """Extends the DP rows as chunks of the mutated sequence arrive"""
+
+    def __init__(self, healthy_DNA, ins_cost, del_cost, sub_cost, checkpoint_interval=None):
+        self.healthy_DNA = healthy_DNA
+        self.costs = (ins_cost, del_cost, sub_cost)
+        self.adaptive = checkpoint_interval is None
+        self.checkpoint_interval = _INITIAL_INTERVAL if self.adaptive else max(1, checkpoint_interval)
+        self.frontier, _ = initial_dp_row(healthy_DNA, ins_cost)
+        self.checkpoints = {0: array("q", self.frontier)}   # row index -> saved dp row
+        self.chunks = []                        # received bases, needed to replay blocks
+        self.rows = 0                           # number of mutated bases consumed
+
+    @profiled("fill")
+    def feed(self, chunk):
+        """Consume one chunk and return the running costs"""
+        chunk = "".join(chunk.split()).upper()
+        healthy_DNA = self.healthy_DNA
+        ins_cost, del_cost, sub_cost = self.costs
+        row = self.frontier
+        i = self.rows
+        for base in chunk:
+            i += 1
+            row, _ = next_dp_row(row, i, base, healthy_DNA, ins_cost, del_cost, sub_cost, with_choice=False)
+            if i % self.checkpoint_interval == 0:
+                self._add_checkpoint(i, row)
+        self.frontier = row
+        self.rows = i
+        count(cells=len(chunk) * len(healthy_DNA))
+        if chunk:
+            self.chunks.append(chunk)
+        return self.progress()
+
+    def _add_checkpoint(self, i, row):
+        self.checkpoints[i] = array("q", row)
+        if self.adaptive and len(self.checkpoints) > self.checkpoint_interval:
+            # More blocks than rows per block: double the interval, keep every other checkpoint
+            self.checkpoint_interval *= 2
+            self.checkpoints = {k: saved for k, saved in self.checkpoints.items()
+                                if k % self.checkpoint_interval == 0}
+
+    def progress(self):
+        # cost: full healthy sequence vs everything received so far
+        # best_prefix_cost: best alignment of the received bases to any healthy prefix
+        return {"rows": self.rows, "cost": self.frontier[-1], "best_prefix_cost": min(self.frontier)}
+
+    @profiled("traceback")
+    def finish(self):
+        """Recover the optimal pathway once the stream has ended"""
+        mutated_DNA = "".join(self.chunks)
+        healthy_DNA = self.healthy_DNA
+        ins_cost, del_cost, sub_cost = self.costs
+        i, j = self.rows, len(healthy_DNA)
+        ops = []
+
+        starts = sorted(self.checkpoints)
+        while i > 0:
+            # Largest checkpoint strictly above row i: replay its block with choices
+            while starts[-1] >= i:
+                starts.pop()
+            start = starts[-1]
+            row = self.checkpoints[start]
+            choice_rows = []
+            for k in range(start + 1, i + 1):
+                row, choice_row = next_dp_row(row, k, mutated_DNA[k - 1], healthy_DNA, ins_cost, del_cost, sub_cost)
+                choice_rows.append(choice_row)
+
+            # Trace back inside the block until we leave it through its top row
+            while i > start:
+                op, di, dj = _ACTION_MOVES[choice_rows[i - start - 1][j]]
+                ops.append(op)
+                i -= di
+                j -= dj
+
+        ops.extend(OP_INSERT * j)   # row 0: only insertions remain
+        count(cells=len(ops))
+        ops.reverse()
+        return {"rows": self.rows, "cost": self.frontier[-1], "ops": "".join(ops), "mutated_DNA": mutated_DNA}
+
+
+def align_stream(chunks, healthy_DNA, ins_cost, del_cost, sub_cost, checkpoint_interval=None):
+    # Generator: yields a progress dict after every chunk, then the final
+    # result (progress fields plus "ops", "mutated_DNA" and "done": True)
+    aligner = StreamingAligner(healthy_DNA, ins_cost, del_cost, sub_cost, checkpoint_interval)
+    for chunk in chunks:
+        yield aligner.feed(chunk)
+    result = aligner.finish()
+    result["done"] = True
+    yield result
+
+
+async def align_stream_async(chunks, healthy_DNA, ins_cost, del_cost, sub_cost, checkpoint_interval=None):
+    # Same as align_stream for an async iterator of chunks
+    aligner = StreamingAligner(healthy_DNA, ins_cost, del_cost, sub_cost, checkpoint_interval)
+    async for chunk in chunks:
+        yield aligner.feed(chunk)
+    result = aligner.finish()
+    result["done"] = True
+    yield result
@@ -1,10 +1,151 @@
-def print_dp_table(dp):
-    print("\nDP Table:")
-    for row in dp:
-        print(row)
+import json
 
-def print_choice_table(choice):
-    print("\nChoice Table:")
-    for row in choice:
-        print(row)
 
+def print_dp_table(dp, out=None):
+    # Rows are joined and written once instead of one print() per row
+    text = "\nDP Table:\n" + "\n".join(str(row) for row in dp) + "\n"
+    if out is None:
+        print(text, end="")
+    else:
+        out.write(text)
+
+def print_choice_table(choice, out=None):
+    text = "\nChoice Table:\n" + "\n".join(str(row) for row in choice) + "\n"
+    if out is None:
+        print(text, end="")
+    else:
+        out.write(text)
+
+
+def ops_to_cigar(ops):
+    # Extended CIGAR with the healthy sequence as reference:
+    # an extra base in the mutated sequence (DELETE) is an 'I' in CIGAR terms,
+    # a base missing from the mutated sequence (INSERT) is a 'D'.
+    cigar_codes = {"=": "=", "X": "X", "D": "I", "I": "D"}
+    parts = []
+    run_op, run_len = None, 0
+    for op in ops:
+        if op == run_op:
+            run_len += 1
+            continue
+        if run_op is not None:
+            parts.append(f"{run_len}{cigar_codes[run_op]}")
+        run_op, run_len = op, 1
+    if run_op is not None:
+        parts.append(f"{run_len}{cigar_codes[run_op]}")
+    return "".join(parts)
+
+
+def iter_op_records(ops, mutated_DNA, healthy_DNA):
+    # Yields (operation, mutated_pos, healthy_pos, mutated_base, healthy_base)
+    # for every non-match op; positions are 1-based, 0 when the base is absent.
+    names = {"X": "SUBSTITUTE", "D": "DELETE", "I": "INSERT"}
+    i = j = 0
+    for op in ops:
+        if op == "=":
+            i += 1
+            j += 1
+        elif op == "X":
+            i += 1
+            j += 1
+            yield names[op], i, j, mutated_DNA[i - 1], healthy_DNA[j - 1]
+        elif op == "D":
+            i += 1
+            yield names[op], i, 0, mutated_DNA[i - 1], "-"
+        else:
+            j += 1
+            yield names[op], 0, j, "-", healthy_DNA[j - 1]
+
+
+def format_text(result):
+    lines = [f"Minimum Mutation Cost: {result['cost']}", "", "Mutation Steps:"]
+    for name, i, j, a, b in iter_op_records(result["ops"], result["mutated_DNA"], result["healthy_DNA"]):
+        if name == "SUBSTITUTE":
+            lines.append(f"- Substitute {a} → {b}")
+        elif name == "DELETE":
+            lines.append(f"- Delete {a}")
+        else:
+            lines.append(f"- Insert {b}")
+    if "optimal_paths" in result:
+        lines.append("")
+        lines.append(f"Co-optimal pathways: {result['optimal_paths']}")
+    for k, ops in enumerate(result.get("paths", ()), 1):
+        # One line per pathway: its CIGAR, then every event with its 1-based positions
+        events = []
+        for name, i, j, a, b in iter_op_records(ops, result["mutated_DNA"], result["healthy_DNA"]):
+            if name == "SUBSTITUTE":
+                events.append(f"Substitute {a} → {b} (mutated {i}, healthy {j})")
+            elif name == "DELETE":
+                events.append(f"Delete {a} (mutated {i})")
+            else:
+                events.append(f"Insert {b} (healthy {j})")
+        lines.append(f"  {k}. {ops_to_cigar(ops)}: {'; '.join(events)}")
+    return "\n".join(lines) + "\n"
+
+
+def format_json(result):
+    records = [
+        {"op": name, "mutated_pos": i, "healthy_pos": j, "mutated_base": a, "healthy_base": b}
+        for name, i, j, a, b in iter_op_records(result["ops"], result["mutated_DNA"], result["healthy_DNA"])
+    ]
+    payload = {
+        "mutated_file": result.get("mutated_file"),
+        "healthy_file": result.get("healthy_file"),
+        "mutated_length": len(result["mutated_DNA"]),
+        "healthy_length": len(result["healthy_DNA"]),
+        "costs": result["costs"],
+        "cost": result["cost"],
+        "cigar": ops_to_cigar(result["ops"]),
+        "steps": records,
+    }
+    if "optimal_paths" in result:
+        payload["optimal_paths"] = result["optimal_paths"]
+    if "paths" in result:
+        payload["paths"] = [
+            {"cigar": ops_to_cigar(ops),
+             "steps": [{"op": name, "mutated_pos": i, "healthy_pos": j, "mutated_base": a, "healthy_base": b}
+                       for name, i, j, a, b in iter_op_records(ops, result["mutated_DNA"], result["healthy_DNA"])]}
+            for ops in result["paths"]
+        ]
+    return json.dumps(payload, indent=2) + "\n"
+
+
+def format_tsv(result):
+    lines = ["#cost\t" + str(result["cost"])]
+    # Co-optimal pathways (--paths) as comment lines, so the step table below is unchanged
+    lines.extend(f"#path\t{k}\t{ops_to_cigar(ops)}" for k, ops in enumerate(result.get("paths", ()), 1))
+    lines.append("step\top\tmutated_pos\thealthy_pos\tmutated_base\thealthy_base")
+    records = iter_op_records(result["ops"], result["mutated_DNA"], result["healthy_DNA"])
+    for k, (name, i, j, a, b) in enumerate(records, 1):
+        lines.append(f"{k}\t{name}\t{i}\t{j}\t{a}\t{b}")
+    return "\n".join(lines) + "\n"
+
+
+def format_cigar(result):
+    # With --paths, one line per co-optimal pathway (the first is the default pathway)
+    return "".join(f"{ops_to_cigar(ops)}\t{result['cost']}\n" for ops in result.get("paths", [result["ops"]]))
+
+
+FORMATTERS = {
+    "text": format_text,
+    "json": format_json,
+    "tsv": format_tsv,
+    "cigar": format_cigar,
+}
+
+
+def format_batch(results, fmt):
+    # One line (or JSON object) per sample: name, cost and CIGAR
+    if fmt == "json":
+        return json.dumps([
+            {"name": r["name"], "mutated_length": len(r["mutated_DNA"]),
+             "cost": r["cost"], "cigar": ops_to_cigar(r["ops"])}
+            for r in results
+        ], indent=2) + "\n"
+    lines = ["name\tcost\tcigar"] if fmt == "tsv" else []
+    for r in results:
+        if fmt == "text":
+            lines.append(f"{r['name']}: cost {r['cost']}  {ops_to_cigar(r['ops'])}")
+        else:
+            lines.append(f"{r['name']}\t{r['cost']}\t{ops_to_cigar(r['ops'])}")
+    return "\n".join(lines) + "\n"